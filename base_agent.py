@@ -4,10 +4,139 @@ Provides a foundation for agents with a core reasoning loop (Think -> Act).
 """
 
 # No longer need ABC since BaseAgent is now a concrete class
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from enum import StrEnum
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
-from opperai import Opper
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
 import time
+import uuid
+from types import SimpleNamespace
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding for cache keys
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Verbose agents log here instead; it writes to stdout and doesn't propagate, so quiet
+# agents stay quiet and a host application's root handler never sees a line twice
+verbose_logger = logger.getChild("verbose")
+
+_opper_class = None
+
+
+def _get_opper_class() -> type:
+    """Import the Opper client class on first use so importing this module stays cheap."""
+    global _opper_class
+    if _opper_class is None:
+        from opperai import Opper
+        _opper_class = Opper
+    return _opper_class
+
+
+def _stable_json(data: Any) -> bytes:
+    """Serialize data to JSON bytes with sorted keys, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r, using %s", name, value, default)
+        return default
+
+
+# Most independent tool calls from one step run at once (TOOL_CONCURRENCY_LIMIT env var)
+TOOL_CONCURRENCY_LIMIT = _env_positive_int("TOOL_CONCURRENCY_LIMIT", 1)
+
+
+def _get_verbose_logger() -> logging.Logger:
+    """Return verbose_logger, attaching its plain stdout handler on first use."""
+    if not verbose_logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        verbose_logger.addHandler(handler)
+        verbose_logger.setLevel(logging.DEBUG)
+        verbose_logger.propagate = False
+    return verbose_logger
+
+
+@lru_cache(maxsize=None)
+def _model_json_schema(model: type) -> Dict[str, Any]:
+    """Build the JSON schema for a Pydantic model once and reuse it."""
+    return model.model_json_schema()
+
+
+def _schema_cache_key(schema: Any) -> Any:
+    """Identify a schema in LLM cache keys; classes by their full dotted path, so equally named models don't collide."""
+    if isinstance(schema, type):
+        return f"{schema.__module__}.{schema.__qualname__}"
+    return schema
+
+
+def _resolve_schema(schema: Any) -> Any:
+    """Return a cached JSON schema for Pydantic models, pass anything else through."""
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return _model_json_schema(schema)
+    return schema
+
+
+# Instructions for the THINK step, formatted with the iteration counters on each call
+_THINK_INSTRUCTIONS = """You are implementing the THINK step in a Think -> Act reasoning loop.
+
+YOUR RESPONSIBILITIES:
+1. ANALYZE the current situation toward achieving the goal
+2. REVIEW previous action results and update context if needed
+3. DECIDE if the goal has been achieved or if another action is needed
+4. CHOOSE the specific tool and parameters for the next action
+
+THINKING PROCESS:
+- Consider the main goal and current progress
+- Analyze the last action result (if any) and what it tells you
+- Review execution_context for important data from previous actions
+- Be AWARE of your iteration count: you are on iteration {current_iteration} of {max_iterations} maximum
+- With {iterations_remaining} iterations remaining, plan efficiently to complete the goal
+- If approaching iteration limit, prioritize the most important parts of the goal
+- Determine if goal is achieved or what action is needed next
+
+CONTEXT UPDATES:
+If the last action produced useful results, extract important data into context_updates:
+- Use descriptive keys (e.g., 'email_count', 'calculation_result', 'user_preference')
+- Store IDs, references, computed values, or state information
+- This data will be available in future think cycles
+
+GOAL ACHIEVEMENT:
+Set goal_achieved=true only if the main goal is completely accomplished.
+
+ACTION SELECTION:
+If an action is needed (next_action_needed=true):
+- Choose the most appropriate tool for the next step
+- Always use tools to complete the goal if possible
+- Provide ALL required parameters
+- Use data from execution_context when available
+- If several independent tool calls are needed (none depends on another's result), list them all in tool_calls, each with tool_name and tool_parameters
+- Set tool_name to 'direct_response' only if no tool makes sense AND you can complete the goal without tools
+- Set tool_name to 'none' if goal is achieved
+
+Be thorough in your reasoning and decisive in your action selection."""
 
 
 class Tool(BaseModel):
@@ -52,7 +181,7 @@ class Tool(BaseModel):
             name=name,
             instructions=instructions,
             input=input_data,
-            output_schema=output_schema,
+            output_schema=_resolve_schema(output_schema),
             parent_span_id=parent_span_id,
             model=model or "groq/gpt-oss-120b"
         )
@@ -66,6 +195,7 @@ class Thought(BaseModel):
     next_action_needed: bool = Field(description="Whether an action is needed to make progress")
     tool_name: str = Field(description="Name of the tool to use, or 'direct_response' for direct completion, or 'none' if goal achieved")
     tool_parameters: Dict[str, Any] = Field(description="Parameters to pass to the tool")
+    tool_calls: List[Dict[str, Any]] = Field(default_factory=list, description="Optional list of independent tool calls to run together, each with 'tool_name' and 'tool_parameters'")
     expected_outcome: str = Field(description="What we expect to happen from this action")
     user_message: str = Field(description="A note to the user on what you are about to do")
 
@@ -78,6 +208,18 @@ class ActionResult(BaseModel):
     execution_time: float = Field(description="Time taken to execute the action")
 
 
+class EventType(StrEnum):
+    """Status event types passed to the agent callback.
+    
+    Members are str subclasses, so callbacks comparing against plain strings keep working.
+    """
+    GOAL_START = "goal_start"
+    THOUGHT_CREATED = "thought_created"
+    ACTION_EXECUTED = "action_executed"
+    GOAL_COMPLETED = "goal_completed"
+    BATCH = "batch"
+
+
 class BaseAgent:
     """
     Base class for AI agents using Opper with a core reasoning loop.
@@ -93,6 +235,10 @@ class BaseAgent:
     2. Subclassing: override get_tools(), get_agent_description(), is_goal_achieved()
     """
     
+    # Characters of each earlier action result shown to the LLM when generating the final
+    # result; the last successful one is always shown in full
+    final_result_excerpt_chars: int = 500
+    
     def __init__(
         self,
         name: str,
@@ -102,7 +248,12 @@ class BaseAgent:
         output_schema: Optional[type] = None,
         tools: Optional[List[Tool]] = None,
         description: Optional[str] = None,
-        callback: Optional[callable] = None
+        callback: Optional[callable] = None,
+        speculative_final_result: bool = False,
+        llm_cache_size: int = 0,
+        record_timings: bool = False,
+        batch_callbacks: bool = False,
+        background_spans: bool = False
     ):
         """
         Initialize the base agent.
@@ -116,13 +267,31 @@ class BaseAgent:
             tools: Optional list of tools (if provided, get_tools() doesn't need to be implemented)
             description: Optional description (if provided, get_agent_description() doesn't need to be implemented)
             callback: Optional callback function to receive status updates (event_type, data)
+            speculative_final_result: Whether to generate the final result in the background after each
+                iteration, overlapping it with the next think step (costs an extra LLM call per iteration)
+            llm_cache_size: Number of identical LLM calls to remember and answer without calling Opper
+                (default 0, disabled); cached answers are replayed without a new call or span
+            record_timings: Whether to stamp each execution history cycle with a monotonic timestamp (ns)
+            batch_callbacks: Whether to buffer status updates and deliver them once per iteration
+                as a single 'batch' event instead of calling the callback for every update
+            background_spans: Whether to send tracing span creates/updates from a background thread
+                using client-generated span IDs, instead of blocking the loop on each span API call
         """
         self.name = name
-        self.opper = Opper(http_bearer=opper_api_key)
+        self.opper = _get_opper_class()(http_bearer=opper_api_key)
         self.max_iterations = max_iterations
         self.verbose = verbose
+        # Per-agent: verbose agents print their debug lines, the others leave them to
+        # whatever logging configuration the host application has for this module
+        self._logger = _get_verbose_logger() if verbose else logger
         self.output_schema = output_schema
         self.callback = callback
+        self.speculative_final_result = speculative_final_result
+        self.llm_cache_size = llm_cache_size
+        self.record_timings = record_timings
+        self.batch_callbacks = batch_callbacks
+        self._event_buffer: List[Tuple[str, Any]] = []
+        self.background_spans = background_spans
         
         # Initialize agent state
         self.current_thought: Optional[Thought] = None
@@ -130,9 +299,33 @@ class BaseAgent:
         self.current_goal: Optional[str] = None
         self.execution_context: Dict[str, Any] = {}  # Context data shared between iterations
         self.last_action_result: Optional[ActionResult] = None
+        self._recent_context: deque = deque(maxlen=3)  # Compact summaries of recent cycles for thinking
+        self._iterations_run = 0
+        self._goal_achieved_early = False
+        self._speculative_result = None  # Pending speculative final result, if any
+        
+        # Worker pool for independent tool calls requested in the same step
+        self._tool_pool = ThreadPoolExecutor(max_workers=TOOL_CONCURRENCY_LIMIT)
+        self._speculation_pool = ThreadPoolExecutor(max_workers=1) if speculative_final_result else None
+        
+        # Span operations sent to Opper by a daemon thread when background_spans is enabled
+        self._span_queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        if background_spans:
+            threading.Thread(target=self._run_span_worker, name=f"{name}-spans", daemon=True).start()
+        
+        # Responses of previous LLM calls, keyed by a hash of the call, in LRU order
+        self._llm_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+        
+        # Serialized tool descriptions for the LLM, rebuilt when the toolkit changes
+        self._tool_descriptors_cache: Optional[List[Dict[str, Any]]] = None
         
         # Get tools and description (from constructor or subclass)
         self.tools = tools if tools is not None else self.get_tools()
+        self._tool_index: Dict[str, Tool] = {}
+        for tool in self.tools:
+            # First tool registered under a name wins, as with a linear scan
+            self._tool_index.setdefault(tool.name, tool)
         self.description = description if description is not None else self.get_agent_description()
         
         # Initialize agent state
@@ -142,15 +335,30 @@ class BaseAgent:
         """Initialize agent-specific state. Override in subclasses if needed."""
         pass
     
-    def _emit_status(self, event_type: str, data: Any):
+    def _emit_status(self, event_type: EventType, data: Any):
         """Emit a status update through the callback if one is provided."""
-        if self.callback:
-            try:
-                self.callback(event_type, data)
-            except Exception as e:
-                # Don't let callback errors break the agent
-                if self.verbose:
-                    print(f"⚠️  Callback error for {event_type}: {e}")
+        if not self.callback:
+            return
+        if self.batch_callbacks:
+            # Delivered together by _flush_events()
+            self._event_buffer.append((event_type, data))
+            return
+        self._deliver_status(event_type, data)
+    
+    def _deliver_status(self, event_type: EventType, data: Any):
+        """Invoke the callback, keeping callback errors from breaking the agent."""
+        try:
+            self.callback(event_type, data)
+        except Exception as e:
+            # Don't let callback errors break the agent
+            self._logger.debug("⚠️  Callback error for %s: %s", event_type, e)
+    
+    def _flush_events(self):
+        """Deliver buffered status updates as a single 'batch' event of (event_type, data) pairs."""
+        if not self._event_buffer:
+            return
+        events, self._event_buffer = self._event_buffer, []
+        self._deliver_status(EventType.BATCH, events)
     
     def get_tools(self) -> List[Tool]:
         """
@@ -196,17 +404,28 @@ class BaseAgent:
     def add_tool(self, tool: Tool):
         """Add a tool to the agent's toolkit."""
         self.tools.append(tool)
+        self._tool_index.setdefault(tool.name, tool)
+        self._tool_descriptors_cache = None
     
     def remove_tool(self, tool_name: str):
         """Remove a tool from the agent's toolkit."""
         self.tools = [tool for tool in self.tools if tool.name != tool_name]
+        self._tool_index.pop(tool_name, None)
+        self._tool_descriptors_cache = None
+    
+    @property
+    def tool_descriptors(self) -> List[Dict[str, Any]]:
+        """Name, description and parameters of each tool, as presented to the LLM."""
+        if self._tool_descriptors_cache is None:
+            self._tool_descriptors_cache = [
+                {"name": tool.name, "description": tool.description, "parameters": tool.parameters}
+                for tool in self.tools
+            ]
+        return self._tool_descriptors_cache
     
     def get_tool(self, tool_name: str) -> Optional[Tool]:
         """Get a specific tool by name."""
-        for tool in self.tools:
-            if tool.name == tool_name:
-                return tool
-        return None
+        return self._tool_index.get(tool_name)
     
     def list_tools(self) -> List[str]:
         """Get a list of available tool names."""
@@ -218,10 +437,10 @@ class BaseAgent:
         context = {
             "goal": goal,
             "agent_description": self.description,
-            "available_tools": [{"name": tool.name, "description": tool.description, "parameters": tool.parameters} for tool in self.tools],
-            "execution_history": self.execution_history[-3:] if self.execution_history else [],  # Last 3 cycles for context
+            "available_tools": self.tool_descriptors,
+            "execution_history": list(self._recent_context),  # Compact summaries of the last 3 cycles
             "execution_context": self.execution_context,
-            "last_action_result": self.last_action_result.dict() if self.last_action_result else None,
+            "last_action_result": self.last_action_result.model_dump(mode="json") if self.last_action_result else None,
             "current_iteration": current_iteration,
             "max_iterations": self.max_iterations,
             "iterations_remaining": self.max_iterations - current_iteration
@@ -229,52 +448,21 @@ class BaseAgent:
         
         think_call = self.call_llm(
             name="think",
-            instructions=f"""You are implementing the THINK step in a Think -> Act reasoning loop.
-
-YOUR RESPONSIBILITIES:
-1. ANALYZE the current situation toward achieving the goal
-2. REVIEW previous action results and update context if needed
-3. DECIDE if the goal has been achieved or if another action is needed
-4. CHOOSE the specific tool and parameters for the next action
-
-THINKING PROCESS:
-- Consider the main goal and current progress
-- Analyze the last action result (if any) and what it tells you
-- Review execution_context for important data from previous actions
-- Be AWARE of your iteration count: you are on iteration {current_iteration} of {self.max_iterations} maximum
-- With {self.max_iterations - current_iteration} iterations remaining, plan efficiently to complete the goal
-- If approaching iteration limit, prioritize the most important parts of the goal
-- Determine if goal is achieved or what action is needed next
-
-CONTEXT UPDATES:
-If the last action produced useful results, extract important data into context_updates:
-- Use descriptive keys (e.g., 'email_count', 'calculation_result', 'user_preference')
-- Store IDs, references, computed values, or state information
-- This data will be available in future think cycles
-
-GOAL ACHIEVEMENT:
-Set goal_achieved=true only if the main goal is completely accomplished.
-
-ACTION SELECTION:
-If an action is needed (next_action_needed=true):
-- Choose the most appropriate tool for the next step
-- Always use tools to complete the goal if possible
-- Provide ALL required parameters
-- Use data from execution_context when available
-- Set tool_name to 'direct_response' only if no tool makes sense AND you can complete the goal without tools
-- Set tool_name to 'none' if goal is achieved
-
-Be thorough in your reasoning and decisive in your action selection.""",
+            instructions=_THINK_INSTRUCTIONS.format(
+                current_iteration=current_iteration,
+                max_iterations=self.max_iterations,
+                iterations_remaining=self.max_iterations - current_iteration
+            ),
             input_data=context,
             output_schema=Thought,
             parent_span_id=parent_span_id
         )
         
-        return Thought(**think_call.json_payload)
+        # Validate the payload dict in a single pass
+        return Thought.model_validate(think_call.json_payload)
     
     def _execute_action(self, thought: Thought, parent_span_id: Optional[str] = None) -> ActionResult:
         """Execute the action determined by the thought."""
-        import time
         start_time = time.time()
         
         if thought.tool_name == "none" or not thought.next_action_needed:
@@ -299,85 +487,175 @@ Be thorough in your reasoning and decisive in your action selection.""",
                 execution_time=execution_time
             )
         
+        if len(thought.tool_calls) > 1:
+            # Independent tool calls requested in a single step
+            return self._execute_tool_calls(thought.tool_calls, parent_span_id)
+        
+        return self._execute_tool(thought.tool_name, thought.tool_parameters, parent_span_id)
+    
+    def _execute_tool(self, tool_name: str, tool_parameters: Dict[str, Any], parent_span_id: Optional[str] = None) -> ActionResult:
+        """Find and execute a single tool, tracing it under the given parent span."""
+        start_time = time.time()
+        
         # Find and execute the tool
-        tool = self.get_tool(thought.tool_name)
+        tool = self.get_tool(tool_name)
         if not tool:
+            # Name the valid tools so the next think step can correct itself right away
             execution_time = time.time() - start_time
             return ActionResult(
                 success=False,
-                result=f"Tool '{thought.tool_name}' not found",
-                tool_name=thought.tool_name,
-                parameters=thought.tool_parameters,
+                result=f"Tool '{tool_name}' not found. Available tools: {', '.join(self.list_tools())}",
+                tool_name=tool_name,
+                parameters=tool_parameters,
                 execution_time=execution_time
             )
         
         try:
             # Create a span for this tool execution
-            tool_span = None
+            tool_span_id = None
             if parent_span_id:
-                tool_span = self.opper.spans.create(
-                    name=f"tool_{thought.tool_name}",
-                    input=f"Tool: {thought.tool_name}, Parameters: {thought.tool_parameters}",
+                tool_span_id = self._create_span(
+                    name=f"tool_{tool_name}",
+                    input=f"Tool: {tool_name}, Parameters: {tool_parameters}",
                     parent_id=parent_span_id
                 )
             
             # Execute the tool with tracing context
-            result = tool.execute(_parent_span_id=tool_span.id if tool_span else None, **thought.tool_parameters)
+            result = tool.execute(_parent_span_id=tool_span_id, **tool_parameters)
             
             execution_time = time.time() - start_time
             
             # Update the tool span with results
-            if tool_span:
-                self.opper.spans.update(
-                    span_id=tool_span.id,
+            if tool_span_id:
+                self._update_span(
+                    span_id=tool_span_id,
                     output=f"Success: {str(result)[:200]}..."
                 )
             
             return ActionResult(
                 success=True,
                 result=str(result),
-                tool_name=thought.tool_name,
-                parameters=thought.tool_parameters,
+                tool_name=tool_name,
+                parameters=tool_parameters,
                 execution_time=execution_time
             )
         except Exception as e:
             execution_time = time.time() - start_time
             
             # Update the tool span with error
-            if tool_span:
-                self.opper.spans.update(
-                    span_id=tool_span.id,
+            if tool_span_id:
+                self._update_span(
+                    span_id=tool_span_id,
                     output=f"Error: {str(e)}"
                 )
             
             return ActionResult(
                 success=False,
                 result=f"Error executing tool: {str(e)}",
-                tool_name=thought.tool_name,
-                parameters=thought.tool_parameters,
+                tool_name=tool_name,
+                parameters=tool_parameters,
                 execution_time=execution_time
             )
-
     
+    def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]], parent_span_id: Optional[str] = None) -> ActionResult:
+        """
+        Execute several independent tool calls on the agent's tool pool.
+        
+        Results are combined in the original call order. A failing call is reported
+        in its own entry and doesn't cancel the rest of the batch.
+        """
+        start_time = time.time()
+        
+        futures = [
+            self._tool_pool.submit(
+                self._execute_tool,
+                call.get("tool_name", ""),
+                call.get("tool_parameters") or {},
+                parent_span_id
+            )
+            for call in tool_calls
+        ]
+        
+        results = []
+        for call, future in zip(tool_calls, futures, strict=True):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(ActionResult(
+                    success=False,
+                    result=f"Error executing tool: {str(e)}",
+                    tool_name=call.get("tool_name", ""),
+                    parameters=call.get("tool_parameters") or {},
+                    execution_time=time.time() - start_time
+                ))
+        
+        return ActionResult(
+            success=all(result.success for result in results),
+            result=str([
+                {"tool_name": result.tool_name, "success": result.success, "result": result.result}
+                for result in results
+            ]),
+            tool_name=", ".join(result.tool_name for result in results),
+            parameters={"tool_calls": tool_calls},
+            execution_time=time.time() - start_time
+        )
 
+    @staticmethod
+    def _summarize_cycle(cycle: Dict[str, Any], result_chars: Optional[int]) -> Dict[str, Any]:
+        """Compact view of an execution history cycle with the action result truncated (None keeps it whole)."""
+        return {
+            "iteration": cycle.get("iteration"),
+            "reasoning": cycle.get("thought_reasoning", ""),
+            "action": cycle.get("action_tool"),
+            "parameters": cycle.get("action_parameters", {}),
+            "success": cycle.get("action_success", False),
+            "result": str(cycle.get("action_result", ""))[:result_chars]
+        }
     
-    def _generate_final_result(self, goal: str, execution_history: List[Dict[str, Any]], parent_span_id: str) -> Any:
-        """Generate the final structured result based on the output schema."""
+    def _generate_final_result(
+        self,
+        goal: str,
+        execution_history: List[Dict[str, Any]],
+        parent_span_id: str,
+        achieved: Optional[bool] = None
+    ) -> Any:
+        """Generate the final structured result based on the output schema.
+        
+        Args:
+            goal: The goal that was processed
+            execution_history: Recorded cycles to base the result on
+            parent_span_id: Span to nest the formatting call under
+            achieved: Precomputed is_goal_achieved() verdict; computed here if omitted
+        """
+        if achieved is None:
+            achieved = self.is_goal_achieved(goal, execution_history)
+        
         if not self.output_schema:
             # Return default result format if no schema specified
             return {
                 "goal": goal,
-                "achieved": self.is_goal_achieved(goal, execution_history),
+                "achieved": achieved,
                 "iterations": len(execution_history),
                 "execution_history": execution_history
             }
         
-        # Generate structured result using the output schema
+        # Generate structured result using the output schema. The LLM sees compact cycle
+        # summaries, except for the last successful action: that one is usually the
+        # deliverable (a report, a draft) and is passed whole. The full history stays
+        # available on the agent.
+        last_success = next(
+            (index for index in range(len(execution_history) - 1, -1, -1)
+             if execution_history[index].get("action_success")),
+            None
+        )
         context = {
             "goal": goal,
-            "execution_history": execution_history,
+            "execution_history": [
+                self._summarize_cycle(cycle, None if index == last_success else self.final_result_excerpt_chars)
+                for index, cycle in enumerate(execution_history)
+            ],
             "agent_description": self.description,
-            "goal_achieved": self.is_goal_achieved(goal, execution_history),
+            "goal_achieved": achieved,
             "iterations": len(execution_history)
         }
         
@@ -448,84 +726,124 @@ Be thorough in your reasoning and decisive in your action selection.""",
         Returns:
             Dictionary containing the final result and execution history
         """
+        trace_id = self._start_goal(goal)
+        for _ in self._run_cycles(goal, trace_id):
+            pass
+        return self._finish_goal(goal, trace_id)
+    
+    def process_stream(self, goal: str) -> Iterator[Dict[str, Any]]:
+        """
+        Process a goal like process(), yielding each cycle as soon as it is recorded.
+        
+        Closing the generator early stops the loop before the next think step and
+        skips the final result. When run to completion, the final result is the
+        generator's return value (e.g. ``result = yield from agent.process_stream(goal)``).
+        
+        Args:
+            goal: The goal to achieve
+            
+        Yields:
+            Cycle dictionaries, as appended to execution_history
+        """
+        trace_id = self._start_goal(goal)
+        try:
+            yield from self._run_cycles(goal, trace_id)
+        except GeneratorExit:
+            # Caller stopped consuming; close the trace without formatting a result
+            if self._speculative_result:
+                self._speculative_result.cancel()
+            self._flush_events()
+            self._update_span(
+                span_id=trace_id,
+                output=f"Stopped by caller after {self._iterations_run} iterations"
+            )
+            if self.background_spans:
+                self._span_queue.join()
+            raise
+        return self._finish_goal(goal, trace_id)
+    
+    def _start_goal(self, goal: str) -> str:
+        """Reset per-goal state, open the trace and announce the goal. Returns the trace span id."""
         self.current_goal = goal
         self.execution_history = []
         self.execution_context = {}  # Reset context for new goal
         self.last_action_result = None  # Reset last action result
+        self._recent_context.clear()
+        self._iterations_run = 0
+        self._goal_achieved_early = False
+        self._speculative_result = None
         
-        # Start a trace for this goal processing session
-        trace = self.start_trace(
-            name=f"{self.name}",
-            input_data=goal
-        )
+        # Start a trace for this goal processing session (through start_trace, so
+        # subclasses overriding it still own the root span)
+        trace_id = self.start_trace(name=f"{self.name}", input_data=goal).id
         
         # Emit goal start event
-        self._emit_status("goal_start", {
+        self._emit_status(EventType.GOAL_START, {
             "goal": goal,
             "agent_name": self.name,
             "available_tools": [tool.name for tool in self.tools]
         })
         
-        if self.verbose:
-            print(f"🎯 Starting goal: {goal}")
-            print(f"🤖 Agent: {self.name}")
-            print(f"🔧 Available tools: {[tool.name for tool in self.tools]}")
-            print(f"🔄 Max iterations: {self.max_iterations}")
+        self._logger.debug("🎯 Starting goal: %s", goal)
+        self._logger.debug("🤖 Agent: %s", self.name)
+        self._logger.debug("🔧 Available tools: %s", self.list_tools())
+        self._logger.debug("🔄 Max iterations: %s", self.max_iterations)
         
+        return trace_id
+    
+    def _run_cycles(self, goal: str, trace_id: str) -> Iterator[Dict[str, Any]]:
+        """Run Think -> Act iterations, recording and yielding each completed cycle."""
         iteration = 0
-        goal_achieved_early = False
         while iteration < self.max_iterations:
             iteration += 1
+            self._iterations_run = iteration
             
             # Create a span for this iteration
-            iteration_span = self.opper.spans.create(
+            iteration_span_id = self._create_span(
                 name=f"iteration_{iteration}",
                 input=f"Iteration {iteration} of goal: {goal}",
-                parent_id=trace.id
+                parent_id=trace_id
             )
             
-            if self.verbose:
-                print(f"\n--- Iteration {iteration} ---")
+            self._logger.debug("\n--- Iteration %s ---", iteration)
             
             # Step 1: Think
-            thought = self._think(goal, iteration_span.id)
+            thought = self._think(goal, iteration_span_id)
+            thought_dict = thought.model_dump(mode="json")
             
             # Emit think event
-            self._emit_status("thought_created", {
+            self._emit_status(EventType.THOUGHT_CREATED, {
                 "iteration": iteration,
-                "thought": thought.dict()
+                "thought": thought_dict
             })
             
-            if self.verbose:
-                print(f"🧠 Thought: {thought.reasoning}")
-                print(f"🎯 Goal achieved: {thought.goal_achieved}")
-                print(f"⚡ Next action: {thought.tool_name}")
+            self._logger.debug("🧠 Thought: %s", thought.reasoning)
+            self._logger.debug("🎯 Goal achieved: %s", thought.goal_achieved)
+            self._logger.debug("⚡ Next action: %s", thought.tool_name)
             
             # Check if goal is achieved
             if thought.goal_achieved:
-                goal_achieved_early = True
-                if self.verbose:
-                    print("✅ Goal achieved!")
+                self._goal_achieved_early = True
+                self._logger.debug("✅ Goal achieved!")
                 break
             
             # Step 2: Act (if action is needed)
             if thought.next_action_needed:
-                action_result = self._execute_action(thought, iteration_span.id)
+                action_result = self._execute_action(thought, iteration_span_id)
                 
                 # Store the action result for the next think cycle
                 self.last_action_result = action_result
                 
                 # Emit action result event
-                self._emit_status("action_executed", {
+                self._emit_status(EventType.ACTION_EXECUTED, {
                     "iteration": iteration,
-                    "thought": thought.dict(),
-                    "action_result": action_result.dict()
+                    "thought": thought_dict,
+                    "action_result": action_result.model_dump(mode="json")
                 })
                 
-                if self.verbose:
-                    print(f"⚡ Action: {action_result.tool_name} with {thought.tool_parameters}")
-                    print(f"📊 Result: {action_result.result}")
-                    print(f"✅ Success: {action_result.success}")
+                self._logger.debug("⚡ Action: %s with %s", action_result.tool_name, thought.tool_parameters)
+                self._logger.debug("📊 Result: %s", action_result.result)
+                self._logger.debug("✅ Success: %s", action_result.success)
             else:
                 # No action needed
                 action_result = ActionResult(
@@ -547,7 +865,7 @@ Be thorough in your reasoning and decisive in your action selection.""",
                 "action_success": action_result.success,
                 "action_result": action_result.result,
                 "execution_time": action_result.execution_time,
-                "timestamp": time.time()
+                "timestamp": time.monotonic_ns() if self.record_timings else None
             }
             
             # Add error details if action failed
@@ -559,50 +877,77 @@ Be thorough in your reasoning and decisive in your action selection.""",
                 }
             
             self.execution_history.append(cycle)
+            self._recent_context.append(self._summarize_cycle(cycle, 200))
             
             # Update the iteration span with the results
-            self.opper.spans.update(
-                span_id=iteration_span.id,
+            self._update_span(
+                span_id=iteration_span_id,
                 output=f"Thought: {thought.reasoning[:100]}... | Action: {action_result.tool_name} | Success: {action_result.success}"
             )
             
             # Update current thought
             self.current_thought = thought
             
+            self._flush_events()
+            
+            if self.speculative_final_result:
+                # The final result only depends on the recorded history, so format it while the
+                # next think step runs. It is used if no further cycle is recorded, else discarded.
+                if self._speculative_result:
+                    self._speculative_result.cancel()
+                self._speculative_result = self._speculation_pool.submit(
+                    self._generate_final_result, goal, list(self.execution_history), trace_id
+                )
+            
+            yield cycle
+    
+    def _finish_goal(self, goal: str, trace_id: str) -> Any:
+        """Produce the final result, announce completion and close the trace."""
+        iteration = self._iterations_run
+        
+        # Evaluate the goal once and reuse the verdict below
+        achieved = self.is_goal_achieved(goal, self.execution_history)
         
         # Generate the final structured result
-        final_result = self._generate_final_result(goal, self.execution_history, trace.id)
+        if self._speculative_result:
+            final_result = self._speculative_result.result()
+        else:
+            final_result = self._generate_final_result(goal, self.execution_history, trace_id, achieved)
         
         # Emit goal completion event
-        self._emit_status("goal_completed", {
+        self._emit_status(EventType.GOAL_COMPLETED, {
             "goal": goal,
-            "achieved": self.is_goal_achieved(goal, self.execution_history),
+            "achieved": achieved,
             "iterations": iteration,
             "final_result": final_result
         })
+        self._flush_events()
         
-        self.opper.spans.update(
-            span_id=trace.id,
+        self._update_span(
+            span_id=trace_id,
             output=str(final_result)
         )
         
-        if self.verbose:
-            print(f"\n🏁 Completed in {iteration} iterations")
+        if self.background_spans:
+            # Let queued span operations land before handing the result back
+            self._span_queue.join()
+        
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("\n🏁 Completed in %s iterations", iteration)
             
             # Check if we reached max iterations without achieving goal
-            if not goal_achieved_early and iteration >= self.max_iterations:
-                print(f"⚠️  Reached maximum iterations ({self.max_iterations}) without achieving goal")
-                print(f"💡 Consider increasing max_iterations or breaking down the goal into smaller steps")
+            if not self._goal_achieved_early and iteration >= self.max_iterations:
+                self._logger.debug("⚠️  Reached maximum iterations (%s) without achieving goal", self.max_iterations)
+                self._logger.debug("💡 Consider increasing max_iterations or breaking down the goal into smaller steps")
             
             # Handle both structured and unstructured results
             if isinstance(final_result, dict) and 'achieved' in final_result:
-                print(f"✅ Goal achieved: {final_result['achieved']}")
+                self._logger.debug("✅ Goal achieved: %s", final_result['achieved'])
             else:
-                goal_achieved = self.is_goal_achieved(goal, self.execution_history)
-                print(f"✅ Goal achieved: {goal_achieved}")
-                if not goal_achieved and iteration >= self.max_iterations:
-                    print(f"🔄 Agent stopped due to iteration limit, goal may be partially complete")
-                print(f"📄 Structured result: {final_result}")
+                self._logger.debug("✅ Goal achieved: %s", achieved)
+                if not achieved and iteration >= self.max_iterations:
+                    self._logger.debug("🔄 Agent stopped due to iteration limit, goal may be partially complete")
+                self._logger.debug("📄 Structured result: %s", final_result)
         
         return final_result
     
@@ -634,15 +979,96 @@ Be thorough in your reasoning and decisive in your action selection.""",
         Returns:
             The result of the LLM call
         """
-        return self.opper.call(
+        # The final result should always reflect the latest run, so it is never cached
+        use_cache = self.llm_cache_size > 0 and name != "generate_final_result"
+        if use_cache:
+            cache_key = self._llm_cache_key(name, instructions, input_schema, output_schema, input_data, model)
+            with self._llm_cache_lock:
+                cached = self._llm_cache.get(cache_key)
+                if cached is not None:
+                    self._llm_cache.move_to_end(cache_key)
+                    return cached
+        
+        response = self.opper.call(
             name=name,
             instructions=instructions,
-            input_schema=input_schema,
-            output_schema=output_schema,
+            input_schema=_resolve_schema(input_schema),
+            output_schema=_resolve_schema(output_schema),
             input=input_data,
             model=model or "groq/gpt-oss-120b",
             parent_span_id=parent_span_id,
         )
+        
+        if use_cache:
+            with self._llm_cache_lock:
+                self._llm_cache[cache_key] = response
+                while len(self._llm_cache) > self.llm_cache_size:
+                    self._llm_cache.popitem(last=False)
+        
+        return response
+    
+    def _llm_cache_key(self, name: str, instructions: str, input_schema: Optional[type],
+                       output_schema: Optional[type], input_data: Any, model: Optional[str]) -> bytes:
+        """Build a stable cache key for an LLM call from everything that shapes its output."""
+        payload = _stable_json({
+            "name": name,
+            "instructions": instructions,
+            "input_schema": _schema_cache_key(input_schema),
+            "output_schema": _schema_cache_key(output_schema),
+            "input_data": input_data,
+            "model": model
+        })
+        return hashlib.blake2b(payload).digest()
+    
+    def clear_llm_cache(self):
+        """Drop all cached LLM responses."""
+        with self._llm_cache_lock:
+            self._llm_cache.clear()
+    
+    def _new_span(self, name: str, input: Optional[str] = None, parent_id: Optional[str] = None) -> Any:
+        """
+        Create a tracing span and return it.
+        
+        With background_spans enabled the ID is generated locally and the span is
+        created by the background span worker, so the caller doesn't wait on the API;
+        the returned stand-in then only carries id, name and input.
+        """
+        kwargs = {"name": name, "input": input}
+        if parent_id:
+            kwargs["parent_id"] = parent_id
+        
+        if self.background_spans:
+            span_id = str(uuid.uuid4())
+            self._span_queue.put(("create", {"id": span_id, **kwargs}))
+            return SimpleNamespace(id=span_id, **kwargs)
+        
+        return self.opper.spans.create(**kwargs)
+    
+    def _create_span(self, name: str, input: Optional[str] = None, parent_id: Optional[str] = None) -> str:
+        """Create a tracing span and return its ID."""
+        return self._new_span(name, input, parent_id).id
+    
+    def _update_span(self, span_id: str, output: str):
+        """Update a tracing span, through the background span worker if enabled."""
+        if self.background_spans:
+            self._span_queue.put(("update", {"span_id": span_id, "output": output}))
+            return
+        self.opper.spans.update(span_id=span_id, output=output)
+    
+    def _run_span_worker(self):
+        """Send queued span operations to Opper in order."""
+        while True:
+            operation, kwargs = self._span_queue.get()
+            try:
+                if operation == "create":
+                    self.opper.spans.create(**kwargs)
+                else:
+                    self.opper.spans.update(**kwargs)
+            except Exception as e:
+                # Tracing failures must not break the agent
+                self._logger.debug("⚠️  Span %s failed: %s", operation, e)
+            finally:
+                self._span_queue.task_done()
     
     def start_trace(self, name: str, input_data: Any = None):
         """
@@ -653,12 +1079,9 @@ Be thorough in your reasoning and decisive in your action selection.""",
             input_data: Input data for the trace
             
         Returns:
-            The created span
+            The created span; with background_spans, a stand-in carrying its id
         """
-        return self.opper.spans.create(
-            name=name,
-            input=str(input_data) if input_data else None
-        )
+        return self._new_span(name=name, input=str(input_data) if input_data else None)
     
     def __str__(self) -> str:
         """String representation of the agent."""
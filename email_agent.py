@@ -5,21 +5,45 @@ Email agent for managing Gmail tasks using the Opper base agent framework.
 import os
 import base64
 import json
+import random
 import re
-from typing import Any, List, Dict, Optional, ClassVar
-from pydantic import BaseModel, Field
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, ClassVar, Union
+from pydantic import BaseModel, Field, TypeAdapter
+from email.header import Header
+from email.utils import formataddr, getaddresses, parseaddr
 
+import google_auth_httplib2
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+try:
+    import pybase64 as _b64
+except ImportError:  # Optional: SIMD-accelerated base64 for message bodies
+    _b64 = base64
+
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing of Gmail API JSON responses
+    orjson = None
 
 from base_agent import BaseAgent, Tool
 
 
+_ANGLE_RE = re.compile(r'<([^>]+)>')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_FIRST_NAME_RE = re.compile(r'^\s*([^\s<]+)')
+
+
+@lru_cache(maxsize=1024)
 def extract_email_address(from_header: str) -> str:
     """
     Extract clean email address from From header.
@@ -31,20 +55,331 @@ def extract_email_address(from_header: str) -> str:
     if not from_header:
         return ""
     
-    # Look for email in angle brackets first
-    match = re.search(r'<([^>]+)>', from_header)
+    # The stdlib parser handles quoted display names, including ones containing '<'
+    _, address = parseaddr(from_header)
+    if '@' in address:
+        return address
+    
+    # Look for email in angle brackets
+    match = _ANGLE_RE.search(from_header)
     if match:
         return match.group(1).strip()
     
     # If no angle brackets, check if the entire string is an email
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if re.match(email_pattern, from_header.strip()):
+    if _EMAIL_RE.match(from_header.strip()):
         return from_header.strip()
     
     # Fallback: return the original if we can't parse it
     return from_header
 
 
+def _extract_headers(payload: Dict, wanted) -> Dict[str, str]:
+    """Collect only the wanted headers from a message payload, stopping once all are found."""
+    wanted = set(wanted)
+    headers: Dict[str, str] = {}
+    for header in payload.get('headers', []):
+        name = header['name']
+        if name in wanted and name not in headers:
+            headers[name] = header['value']
+            if len(headers) == len(wanted):
+                break
+    return headers
+
+
+def _decode_body_data(data: str, max_chars: Optional[int] = None) -> str:
+    """Decode a base64url body, only decoding the prefix needed for max_chars characters."""
+    if max_chars is not None:
+        # A UTF-8 character takes at most 4 bytes, and every 3 bytes take 4 base64 characters
+        encoded_limit = -(-4 * max_chars // 3) * 4
+        if len(data) > encoded_limit:
+            data = data[:encoded_limit]
+    data += "=" * (-len(data) % 4)
+    # A multi-byte character cut off by the slice is dropped by errors='ignore'
+    text = str(_b64.urlsafe_b64decode(data), 'utf-8', 'ignore')
+    return text[:max_chars] if max_chars is not None else text
+
+
+def _decode_body_text(data: str, max_chars: Optional[int] = None) -> str:
+    """
+    Decode a base64url body with surrounding whitespace stripped.
+    
+    With max_chars, returns up to max_chars characters of the stripped text, so a
+    body padded with blank lines only reaches the limit when its text is longer.
+    """
+    if max_chars is None:
+        return _decode_body_data(data).strip()
+    limit = max_chars
+    while True:
+        text = _decode_body_data(data, limit)
+        stripped = text.strip()
+        if len(stripped) >= max_chars:
+            return stripped[:max_chars]
+        if len(text) < limit:
+            # The whole body was decoded
+            return stripped
+        # Whitespace used up part of the limit; decode that much more
+        limit = max_chars + len(text) - len(stripped)
+
+
+def _extract_email_body(payload: Dict, max_chars: Optional[int] = None) -> str:
+    """
+    Extract email body from message payload, preferring plain text over HTML.
+    
+    Nested multipart sections (e.g. multipart/alternative inside multipart/mixed)
+    are walked in document order. With max_chars, only the start of the body is
+    decoded and returned.
+    """
+    html_body = ""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        mime_type = part.get('mimeType', '')
+        if 'parts' in part:
+            # Reversed so parts are popped in their original order
+            stack.extend(reversed(part['parts']))
+        elif mime_type == 'text/plain':
+            data = part.get('body', {}).get('data', '')
+            if data:
+                # Plain text wins, no need to look at the remaining parts
+                return _decode_body_text(data, max_chars)
+        elif mime_type == 'text/html' and not html_body:
+            # Fallback to HTML if no plain text
+            data = part.get('body', {}).get('data', '')
+            if data:
+                html_body = _decode_body_text(data, max_chars)
+    
+    return html_body
+
+
+# Headers holding mailbox lists, whose display names are encoded one by one
+ADDRESS_HEADERS = frozenset({'from', 'to', 'cc', 'bcc', 'reply-to', 'sender'})
+
+# RFC 5322 line ending and the length header lines are folded at
+HEADER_LINESEP = "\r\n"
+HEADER_LINE_LENGTH = 78
+
+# Line endings normalized to CRLF in message bodies (other Unicode line separators are text)
+_LINE_ENDING_RE = re.compile(r'\r?\n')
+
+
+def _format_address(pair: tuple) -> str:
+    """Format a (name, address) pair with an RFC 2047-encoded display name."""
+    name, address = pair
+    if address.isascii() and (not name or name.isascii()):
+        return formataddr(pair)
+    # Internationalized mailbox (SMTPUTF8); only the display name can be encoded
+    if not name:
+        return address
+    # Encoded words fold with CRLF like every other header line
+    return f"{Header(name, 'utf-8').encode(linesep=HEADER_LINESEP)} <{address}>"
+
+
+def _encode_address_header(name: str, value: str) -> str:
+    """Encode a mailbox-list header value, folding between addresses at HEADER_LINE_LENGTH."""
+    folded = ""
+    line_length = len(name) + 1  # "Name:"
+    for address in map(_format_address, getaddresses([value])):
+        first_line, _, rest = address.partition(HEADER_LINESEP)
+        if not folded:
+            line_length += 1  # the space after the colon
+        elif line_length + 2 + len(first_line) > HEADER_LINE_LENGTH:
+            folded += "," + HEADER_LINESEP + " "
+            line_length = 1
+        else:
+            folded += ", "
+            line_length += 2
+        folded += address
+        # A long encoded name already folded itself; continue from its last line
+        line_length = len(address.rpartition(HEADER_LINESEP)[2]) if rest else line_length + len(first_line)
+    return folded
+
+
+def _encode_plain_message(headers: List[tuple], body: str) -> str:
+    """
+    Build a plain-text RFC 2822 message and encode it into the Gmail API 'raw' form.
+    
+    Args:
+        headers: (name, value) pairs such as ('To', 'someone@example.com')
+        body: Plain-text message body
+        
+    Returns:
+        The base64url-encoded message
+    """
+    lines = []
+    for name, value in headers:
+        # Line breaks inside a value would start a new header
+        value = " ".join(str(value).splitlines())
+        if name.lower() in ADDRESS_HEADERS:
+            # RFC 2047: address headers encode each display name
+            value = _encode_address_header(name, value)
+        else:
+            # RFC 2047 for non-ASCII values; ASCII ones are only folded at whitespace
+            charset = 'us-ascii' if value.isascii() else 'utf-8'
+            value = Header(value, charset, header_name=name).encode(linesep=HEADER_LINESEP)
+        lines.append(f"{name}: {value}")
+    lines.append("MIME-Version: 1.0")
+    lines.append("Content-Type: text/plain; charset=utf-8")
+    
+    # Encode the body once and measure its lines on the encoded bytes
+    body_bytes = _LINE_ENDING_RE.sub("\r\n", body).encode("utf-8")
+    if all(len(line) <= 998 for line in body_bytes.split(b"\r\n")):
+        lines.append("Content-Transfer-Encoding: 8bit")
+    else:
+        # RFC 5322 caps lines at 998 bytes; long paragraphs go base64-encoded instead
+        lines.append("Content-Transfer-Encoding: base64")
+        body_bytes = base64.encodebytes(body_bytes).replace(b"\n", b"\r\n")
+    
+    header_block = HEADER_LINESEP.join(lines)
+    if "\n" in header_block.replace(HEADER_LINESEP, ""):
+        # Mixed line endings get drafts rejected or mangled by mail servers
+        raise ValueError("Message headers contain a bare LF")
+    
+    raw_bytes = (header_block + HEADER_LINESEP * 2).encode("utf-8") + body_bytes
+    return _b64.urlsafe_b64encode(raw_bytes).decode("ascii")
+
+
+# Gmail accepts at most 100 calls per batch request
+GMAIL_BATCH_SIZE = 100
+
+# Gmail accepts at most 1000 message IDs per messages.batchModify call
+GMAIL_BATCH_MODIFY_SIZE = 1000
+
+# Headers read when listing emails without their body
+LIST_METADATA_HEADERS = ['Subject', 'From', 'Date', 'Message-ID']
+
+# Headers read from the original message when drafting a reply
+REPLY_METADATA_HEADERS = ['Subject', 'From', 'Message-ID']
+
+# Longest email body passed to the analysis prompt in ReadEmailTool
+MAX_ANALYSIS_BODY_CHARS = 4000
+
+# Recently fetched messages kept by GmailAuthTool, so read -> reply flows don't refetch
+MESSAGE_CACHE_SIZE = 256
+MESSAGE_CACHE_TTL = 60.0  # seconds
+
+# Retry policy for Gmail API calls hitting rate limits or transient server errors
+GMAIL_MAX_RETRIES = 5
+GMAIL_MAX_BACKOFF = 32.0  # seconds
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Concurrent messages.get calls when falling back from batch requests; keeps well
+# under the per-user quota of 3000 messages.get per minute
+GMAIL_FETCH_WORKERS = 10
+
+
+class _GmailJsonModel(JsonModel):
+    """JsonModel that parses response bodies with orjson when it is installed."""
+    
+    def deserialize(self, content):
+        if orjson is None:
+            return super().deserialize(content)
+        try:
+            # orjson takes the raw bytes, skipping the separate UTF-8 decode
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and "data" in body:
+            body = body["data"]
+        return body
+
+
+def _with_backoff(request, idempotent: bool = True, **execute_kwargs):
+    """
+    Execute a Gmail API request, retrying with exponential backoff and jitter.
+    
+    Args:
+        request: The googleapiclient request to execute
+        idempotent: Whether the request is safe to repeat after a server error.
+            Non-idempotent requests (e.g. creating a draft) are only retried on 429,
+            where Gmail guarantees nothing was done.
+        **execute_kwargs: Passed through to request.execute()
+        
+    Returns:
+        The API response
+    """
+    retry_statuses = RETRYABLE_STATUSES if idempotent else (429,)
+    for attempt in range(GMAIL_MAX_RETRIES):
+        try:
+            return request.execute(**execute_kwargs)
+        except HttpError as e:
+            if e.resp.status not in retry_statuses or attempt == GMAIL_MAX_RETRIES - 1:
+                raise
+            time.sleep(min(2 ** attempt + random.random(), GMAIL_MAX_BACKOFF))
+
+
+def _batch_get_messages(gmail_auth_tool: "GmailAuthTool", message_ids: List[str], **get_kwargs) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch several Gmail messages with batch requests instead of one HTTP round trip each.
+    
+    Entries the batch couldn't serve are fetched individually, concurrently when
+    the credentials are available to give each call its own connection.
+    
+    Args:
+        gmail_auth_tool: Authenticated GmailAuthTool providing the service
+        message_ids: IDs of the messages to fetch
+        **get_kwargs: Extra arguments for messages().get(), e.g. format='full'
+        
+    Returns:
+        Dictionary mapping each message ID to its message resource
+    """
+    service = gmail_auth_tool.service
+    credentials = gmail_auth_tool.credentials
+    fetched: Dict[str, Dict[str, Any]] = {}
+    failed: List[str] = []
+    
+    # Serve recently fetched messages from the auth tool's cache
+    for message_id in message_ids:
+        message = gmail_auth_tool.cached_message(message_id, **get_kwargs)
+        if message is not None:
+            fetched[message_id] = message
+    # Unique IDs only: a batch rejects a request_id it already holds
+    to_fetch = list(dict.fromkeys(message_id for message_id in message_ids if message_id not in fetched))
+    
+    def collect(request_id, response, exception):
+        if exception is not None:
+            failed.append(request_id)
+        else:
+            fetched[request_id] = response
+    
+    for start in range(0, len(to_fetch), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=collect)
+        for message_id in to_fetch[start:start + GMAIL_BATCH_SIZE]:
+            batch.add(
+                service.users().messages().get(userId='me', id=message_id, **get_kwargs),
+                request_id=message_id
+            )
+        try:
+            batch.execute()
+        except HttpError:
+            # The batch endpoint itself failed; fetch this chunk individually below
+            failed.extend(
+                message_id for message_id in to_fetch[start:start + GMAIL_BATCH_SIZE]
+                if message_id not in fetched and message_id not in failed
+            )
+    
+    def fetch_one(message_id: str) -> Dict[str, Any]:
+        request = service.users().messages().get(userId='me', id=message_id, **get_kwargs)
+        # The service's Http object isn't thread-safe, so each call gets its own
+        return _with_backoff(request, http=google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http()))
+    
+    # Retry failed entries individually so a real error surfaces as an HttpError
+    if failed and credentials:
+        with ThreadPoolExecutor(max_workers=min(GMAIL_FETCH_WORKERS, len(failed))) as executor:
+            fetched.update(zip(failed, executor.map(fetch_one, failed), strict=True))
+    else:
+        for message_id in failed:
+            fetched[message_id] = _with_backoff(service.users().messages().get(
+                userId='me',
+                id=message_id,
+                **get_kwargs
+            ))
+    
+    for message_id in to_fetch:
+        gmail_auth_tool.cache_message(message_id, fetched[message_id], **get_kwargs)
+    
+    return fetched
+
+
 class EmailMessage(BaseModel):
     """Represents an email message."""
     id: str = Field(description="Gmail message ID")
@@ -54,6 +389,10 @@ class EmailMessage(BaseModel):
     thread_id: str = Field(description="Gmail thread ID")
 
 
+# Serializes a whole list of EmailMessage in a single call
+_EMAIL_LIST_ADAPTER = TypeAdapter(List[EmailMessage])
+
+
 class DraftReply(BaseModel):
     """Represents a draft reply."""
     message_id: str = Field(description="ID of the original message being replied to")
@@ -71,6 +410,10 @@ class EmailAnalysis(BaseModel):
 
 class EmailReadAnalysis(BaseModel):
     """Comprehensive analysis of an email including categorization, labeling, and reply assessment."""
+    
+    # Instances are only read after creation, which lets the fallback below be shared
+    model_config = {"frozen": True}
+    
     email_category: str = Field(description="Category of the email (e.g., 'meeting_request', 'project_update', 'question', 'complaint', 'sales_inquiry', 'support_request', 'social', 'newsletter', 'promotion', 'personal', 'urgent', 'other')")
     suggested_labels: List[str] = Field(description="Suggested Gmail labels/tags for this email (e.g., ['work', 'urgent', 'follow-up'])")
     priority_level: str = Field(description="Priority level: 'low', 'medium', 'high', or 'urgent'")
@@ -82,6 +425,20 @@ class EmailReadAnalysis(BaseModel):
     key_points: List[str] = Field(description="Key points or topics mentioned in the email")
 
 
+# Fallback used by ReadEmailTool when the AI response has an unexpected format
+_DEFAULT_EMAIL_READ_ANALYSIS = EmailReadAnalysis(
+    email_category="other",
+    suggested_labels=["to-review"],
+    priority_level="medium",
+    needs_reply=False,
+    reply_urgency="not_urgent",
+    potential_reply=None,
+    action_items=[],
+    sentiment="neutral",
+    key_points=["Email analysis unavailable"]
+)
+
+
 class GmailAuthTool(Tool):
     """Tool for authenticating with Gmail API."""
     
@@ -101,9 +458,90 @@ class GmailAuthTool(Tool):
             }
         )
         self.service = None
+        self.credentials = None
+        # messages.get responses keyed by (message_id, format, metadata headers, fields) -> (fetched_at, message)
+        self._message_cache: OrderedDict = OrderedDict()
+        self.cached_labels: Optional[Dict[str, str]] = None  # Label name -> ID
+    
+    def get_labels(self, force: bool = False) -> Dict[str, str]:
+        """Return the account's label name -> ID map, listing labels only on first use or when forced."""
+        if self.cached_labels is None or force:
+            existing_labels = _with_backoff(self.service.users().labels().list(
+                userId='me',
+                fields='labels(id,name)'
+            ))
+            self.cached_labels = {label['name']: label['id'] for label in existing_labels.get('labels', [])}
+        return self.cached_labels
+    
+    @staticmethod
+    def _message_cache_key(message_id: str, get_kwargs: Dict[str, Any]) -> tuple:
+        return (
+            message_id,
+            get_kwargs.get('format', 'full'),
+            tuple(get_kwargs.get('metadataHeaders') or ()),
+            get_kwargs.get('fields')
+        )
+    
+    def cached_message(self, message_id: str, **get_kwargs) -> Optional[Dict[str, Any]]:
+        """Return a recently fetched message for these messages().get() arguments, or None."""
+        key = self._message_cache_key(message_id, get_kwargs)
+        entry = self._message_cache.get(key)
+        if entry is None and key[1] == 'metadata':
+            # A full message carries every header, so it can answer a metadata request
+            key = self._message_cache_key(message_id, {'format': 'full'})
+            entry = self._message_cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, message = entry
+        if time.monotonic() - fetched_at > MESSAGE_CACHE_TTL:
+            del self._message_cache[key]
+            return None
+        self._message_cache.move_to_end(key)
+        return message
+    
+    def cache_message(self, message_id: str, message: Dict[str, Any], **get_kwargs):
+        """Remember a messages().get() response, evicting the least recently used entry when full."""
+        key = self._message_cache_key(message_id, get_kwargs)
+        self._message_cache[key] = (time.monotonic(), message)
+        self._message_cache.move_to_end(key)
+        if len(self._message_cache) > MESSAGE_CACHE_SIZE:
+            self._message_cache.popitem(last=False)
+    
+    def invalidate_message(self, message_id: str):
+        """Drop every cached variant of a message, e.g. after its labels changed."""
+        for key in [key for key in self._message_cache if key[0] == message_id]:
+            del self._message_cache[key]
+    
+    def get_message(self, message_id: str, **get_kwargs) -> Dict[str, Any]:
+        """
+        Fetch a message through the cache.
+        
+        Args:
+            message_id: Gmail message ID
+            **get_kwargs: Extra arguments for messages().get(), e.g. format='metadata'
+            
+        Returns:
+            The Gmail message resource
+        """
+        message = self.cached_message(message_id, **get_kwargs)
+        if message is None:
+            message = _with_backoff(self.service.users().messages().get(
+                userId='me',
+                id=message_id,
+                **get_kwargs
+            ))
+            self.cache_message(message_id, message, **get_kwargs)
+        return message
     
     def execute(self, _parent_span_id=None, credentials_file: str = "credentials.json", token_file: str = "token.json", **kwargs) -> Dict[str, Any]:
         """Authenticate with Gmail API."""
+        # Reuse the existing service while its credentials are still valid
+        if self.service and self.credentials and self.credentials.valid:
+            return {
+                "success": True,
+                "message": "Already authenticated with Gmail API"
+            }
+        
         try:
             creds = None
             
@@ -136,8 +574,17 @@ class GmailAuthTool(Tool):
                 with open(token_file, 'w') as token:
                     token.write(creds.to_json())
             
-            # Build service
-            self.service = build('gmail', 'v1', credentials=creds)
+            # Build service from the discovery document bundled with google-api-python-client,
+            # so startup doesn't fetch and parse it over HTTPS
+            self.service = build('gmail', 'v1', credentials=creds, static_discovery=True, cache_discovery=False,
+                                 model=_GmailJsonModel())
+            self.credentials = creds
+            
+            # Prefetch labels during setup so the first tagging call doesn't wait on them
+            try:
+                self.get_labels(force=True)
+            except Exception:
+                self.cached_labels = None
             
             return {
                 "success": True,
@@ -159,7 +606,26 @@ class GmailAuthTool(Tool):
                 }
 
 
-class ListEmailsTool(Tool):
+class GmailTool(Tool):
+    """Base class for tools that call the Gmail API through a shared GmailAuthTool."""
+    
+    # Configure Pydantic to allow extra fields
+    model_config = {"extra": "allow"}
+    
+    def _authenticate(self) -> Optional[Dict[str, Any]]:
+        """
+        Authenticate on first use.
+        
+        Returns:
+            The failed authentication result, or None once the Gmail service is ready
+        """
+        if self.gmail_auth_tool.service:
+            return None
+        auth_result = self.gmail_auth_tool.execute()
+        return None if auth_result["success"] else auth_result
+
+
+class ListEmailsTool(GmailTool):
     """Tool for listing emails from Gmail with basic information."""
     
     # Configure Pydantic to allow extra fields
@@ -180,19 +646,18 @@ class ListEmailsTool(Tool):
     def execute(self, _parent_span_id=None, max_results: int = 10, query: str = "is:inbox", include_body: bool = False, **kwargs) -> Dict[str, Any]:
         """List emails from Gmail."""
         try:
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             service = self.gmail_auth_tool.service
             
             # Fetch message list
-            results = service.users().messages().list(
+            results = _with_backoff(service.users().messages().list(
                 userId='me', 
                 q=query, 
                 maxResults=max_results
-            ).execute()
+            ))
             
             messages = results.get('messages', [])
             
@@ -203,17 +668,24 @@ class ListEmailsTool(Tool):
                     "message": f"No emails found matching query: {query}"
                 }
             
-            # Fetch email details
+            # Fetch email details in batches, keeping the listing order. Without a body only
+            # the headers are needed, so skip downloading the full MIME payload.
+            message_ids = [message['id'] for message in messages]
+            if include_body:
+                fetched = _batch_get_messages(self.gmail_auth_tool, message_ids, format='full')
+            else:
+                fetched = _batch_get_messages(
+                    self.gmail_auth_tool,
+                    message_ids,
+                    format='metadata',
+                    metadataHeaders=LIST_METADATA_HEADERS
+                )
             email_list = []
             for message in messages:
-                msg = service.users().messages().get(
-                    userId='me', 
-                    id=message['id'], 
-                    format='full'
-                ).execute()
+                msg = fetched[message['id']]
                 
                 # Extract email details
-                headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
+                headers = _extract_headers(msg['payload'], ('Subject', 'From', 'Date'))
                 subject = headers.get('Subject', 'No Subject')
                 sender = headers.get('From', 'Unknown Sender')
                 date = headers.get('Date', 'Unknown Date')
@@ -230,7 +702,7 @@ class ListEmailsTool(Tool):
                 
                 # Include body if requested
                 if include_body:
-                    email_info["body"] = self._extract_email_body(msg['payload'])
+                    email_info["body"] = _extract_email_body(msg['payload'])
                 
                 email_list.append(email_info)
             
@@ -252,32 +724,8 @@ class ListEmailsTool(Tool):
                 "error": f"Failed to list emails: {str(e)}"
             }
     
-    def _extract_email_body(self, payload: Dict) -> str:
-        """Extract email body from message payload."""
-        body = ""
-        
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-                elif part['mimeType'] == 'text/html' and not body:
-                    # Fallback to HTML if no plain text
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        else:
-            # Single part message
-            if payload['mimeType'] == 'text/plain':
-                data = payload['body'].get('data', '')
-                if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        
-        return body.strip()
 
-
-class ReadEmailTool(Tool):
+class ReadEmailTool(GmailTool):
     """Tool for reading and analyzing an email with comprehensive categorization and assessment."""
     
     # Configure Pydantic to allow extra fields
@@ -299,30 +747,26 @@ class ReadEmailTool(Tool):
     def execute(self, _parent_span_id=None, message_id: str = None, context: str = "", tone: str = "professional", **kwargs) -> Dict[str, Any]:
         """Read and analyze an email comprehensively."""
         try:
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
-            
-            service = self.gmail_auth_tool.service
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             # Get the email message
-            msg = service.users().messages().get(
-                userId='me', 
-                id=message_id, 
-                format='full'
-            ).execute()
+            msg = self.gmail_auth_tool.get_message(message_id, format='full')
             
             # Extract email details
-            headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
+            headers = _extract_headers(msg['payload'], ('Subject', 'From', 'Date'))
             subject = headers.get('Subject', 'No Subject')
             sender = headers.get('From', 'Unknown Sender')
             date = headers.get('Date', 'Unknown Date')
             
-            # Extract email body
-            body = self._extract_email_body(msg['payload'])
+            # Extract email body, bounded so long emails don't bloat the prompt. One extra
+            # character is decoded to tell whether anything was cut off.
+            body = _extract_email_body(msg['payload'], max_chars=MAX_ANALYSIS_BODY_CHARS + 1)
+            if len(body) > MAX_ANALYSIS_BODY_CHARS:
+                body = body[:MAX_ANALYSIS_BODY_CHARS] + "…[truncated]"
             
-            # Create full email content for analysis
+            # Create full email content for the returned preview
             email_content = f"""
 Subject: {subject}
 From: {sender}
@@ -361,11 +805,12 @@ Provide structured analysis with all requested fields.
 """
             
             # Prepare input data for AI analysis
+            # Headers and body are passed as separate fields rather than repeated in email_content
             input_data = {
-                "email_content": email_content,
                 "subject": subject,
                 "sender": sender,
                 "date": date,
+                "body": body,
                 "tone": tone,
                 "context": context
             }
@@ -382,22 +827,13 @@ Provide structured analysis with all requested fields.
             
             # Extract the structured analysis
             if hasattr(ai_response, 'json_payload') and ai_response.json_payload:
-                analysis = EmailReadAnalysis(**ai_response.json_payload)
+                # Opper already enforced the output schema, so skip re-validating the payload
+                analysis = EmailReadAnalysis.model_construct(**ai_response.json_payload)
             elif isinstance(ai_response, dict):
                 analysis = EmailReadAnalysis(**ai_response)
             else:
                 # Fallback analysis if AI response format is unexpected
-                analysis = EmailReadAnalysis(
-                    email_category="other",
-                    suggested_labels=["to-review"],
-                    priority_level="medium",
-                    needs_reply=False,
-                    reply_urgency="not_urgent",
-                    potential_reply=None,
-                    action_items=[],
-                    sentiment="neutral",
-                    key_points=["Email analysis unavailable"]
-                )
+                analysis = _DEFAULT_EMAIL_READ_ANALYSIS
             
             return {
                 "success": True,
@@ -435,32 +871,8 @@ Provide structured analysis with all requested fields.
                 "error": f"Failed to analyze email: {str(e)}"
             }
     
-    def _extract_email_body(self, payload: Dict) -> str:
-        """Extract email body from message payload."""
-        body = ""
-        
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-                elif part['mimeType'] == 'text/html' and not body:
-                    # Fallback to HTML if no plain text
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        else:
-            # Single part message
-            if payload['mimeType'] == 'text/plain':
-                data = payload['body'].get('data', '')
-                if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        
-        return body.strip()
-
 
-class FetchUnrepliedEmailsTool(Tool):
+class FetchUnrepliedEmailsTool(GmailTool):
     """Tool for fetching unreplied emails from Gmail."""
     
     # Configure Pydantic to allow extra fields
@@ -472,7 +884,7 @@ class FetchUnrepliedEmailsTool(Tool):
             description="Fetch unreplied emails from Gmail inbox",
             parameters={
                 "max_results": "int - Maximum number of emails to fetch (default: 5)",
-                "query": "str - Additional Gmail search query filters (optional)"
+                "query": "str - Additional Gmail search query filters, e.g. 'is:unread' to narrow results (optional; only the last 30 days are searched)"
             }
         )
         self.gmail_auth_tool = gmail_auth_tool
@@ -480,26 +892,26 @@ class FetchUnrepliedEmailsTool(Tool):
     def execute(self, _parent_span_id=None, max_results: int = 5, query: str = "", **kwargs) -> Dict[str, Any]:
         """Fetch unreplied emails from Gmail."""
         try:
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             service = self.gmail_auth_tool.service
             
             # Build search query for unreplied emails
-            base_query = "is:inbox -in:chats -from:me -is:sent"
+            # -from:me already excludes sent mail; newer_than keeps Gmail from scanning all history
+            base_query = "is:inbox -in:chats -from:me newer_than:30d"
             if query:
                 search_query = f"{base_query} {query}"
             else:
                 search_query = base_query
             
             # Fetch message list
-            results = service.users().messages().list(
+            results = _with_backoff(service.users().messages().list(
                 userId='me', 
                 q=search_query, 
                 maxResults=max_results
-            ).execute()
+            ))
             
             messages = results.get('messages', [])
             
@@ -510,22 +922,19 @@ class FetchUnrepliedEmailsTool(Tool):
                     "message": "No unreplied emails found"
                 }
             
-            # Fetch full message details
+            # Fetch full message details in batches, keeping the listing order
+            fetched = _batch_get_messages(self.gmail_auth_tool, [message['id'] for message in messages], format='full')
             email_details = []
             for message in messages:
-                msg = service.users().messages().get(
-                    userId='me', 
-                    id=message['id'], 
-                    format='full'
-                ).execute()
+                msg = fetched[message['id']]
                 
                 # Extract email details
-                headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
+                headers = _extract_headers(msg['payload'], ('Subject', 'From'))
                 subject = headers.get('Subject', 'No Subject')
                 sender = headers.get('From', 'Unknown Sender')
                 
                 # Extract email body
-                body = self._extract_email_body(msg['payload'])
+                body = _extract_email_body(msg['payload'])
                 
                 email_details.append(EmailMessage(
                     id=message['id'],
@@ -537,7 +946,7 @@ class FetchUnrepliedEmailsTool(Tool):
             
             return {
                 "success": True,
-                "emails": [email.model_dump() for email in email_details],
+                "emails": _EMAIL_LIST_ADAPTER.dump_python(email_details),
                 "count": len(email_details)
             }
             
@@ -552,32 +961,8 @@ class FetchUnrepliedEmailsTool(Tool):
                 "error": f"Failed to fetch emails: {str(e)}"
             }
     
-    def _extract_email_body(self, payload: Dict) -> str:
-        """Extract email body from message payload."""
-        body = ""
-        
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-                elif part['mimeType'] == 'text/html' and not body:
-                    # Fallback to HTML if no plain text
-                    data = part['body'].get('data', '')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        else:
-            # Single part message
-            if payload['mimeType'] == 'text/plain':
-                data = payload['body'].get('data', '')
-                if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-        
-        return body.strip()
 
-
-class CreateDraftReplyTool(Tool):
+class CreateDraftReplyTool(GmailTool):
     """Tool for creating draft replies to emails."""
     
     # Configure Pydantic to allow extra fields
@@ -586,17 +971,21 @@ class CreateDraftReplyTool(Tool):
     def __init__(self, gmail_auth_tool: GmailAuthTool):
         super().__init__(
             name="create_draft_reply",
-            description="Create a draft reply to an email",
+            description="Create a draft reply to an email, or several draft replies at once",
             parameters={
                 "message_id": "str - ID of the original message to reply to",
                 "reply_content": "str - Content of the reply",
-                "additional_recipients": "str - Additional recipients (optional, comma-separated)"
+                "additional_recipients": "str - Additional recipients (optional, comma-separated)",
+                "replies": "list - Several replies to draft at once, each a dict with message_id, reply_content and optional additional_recipients (optional, instead of the fields above)"
             }
         )
         self.gmail_auth_tool = gmail_auth_tool
     
-    def execute(self, _parent_span_id=None, message_id: str = None, reply_content: str = None, additional_recipients: str = "", **kwargs) -> Dict[str, Any]:
+    def execute(self, _parent_span_id=None, message_id: str = None, reply_content: str = None, additional_recipients: str = "", replies: List[Dict[str, str]] = None, **kwargs) -> Dict[str, Any]:
         """Create a draft reply to an email."""
+        if replies:
+            return self.create_draft_replies(replies)
+        
         try:
             # Handle both old and new calling conventions
             if message_id is None:
@@ -604,70 +993,114 @@ class CreateDraftReplyTool(Tool):
             if reply_content is None:
                 reply_content = kwargs.get('reply_content', '')
                 
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             service = self.gmail_auth_tool.service
             
             # Get original message
-            original_message = service.users().messages().get(
-                userId='me', 
-                id=message_id, 
-                format='full'
-            ).execute()
-            
-            headers = {h['name']: h['value'] for h in original_message['payload'].get('headers', [])}
-            original_subject = headers.get('Subject', '')
-            sender_raw = headers.get('From', '')
-            sender_email = extract_email_address(sender_raw)
-            message_id_header = headers.get('Message-ID', '')
-            
-            # Create reply subject
-            reply_subject = original_subject
-            if not reply_subject.startswith('Re:'):
-                reply_subject = f"Re: {reply_subject}"
+            # Only headers and the thread ID are needed, not the body
+            original_message = self.gmail_auth_tool.get_message(
+                message_id,
+                format='metadata',
+                metadataHeaders=REPLY_METADATA_HEADERS
+            )
             
-            # Create reply message
-            reply_message = MIMEMultipart()
-            reply_message['To'] = sender_email
+            reply = self._build_reply(original_message, reply_content, additional_recipients)
             
-            if additional_recipients:
-                reply_message['Cc'] = additional_recipients
+            draft = _with_backoff(service.users().drafts().create(
+                userId='me', 
+                body=reply["draft_body"]
+            ), idempotent=False)
             
-            reply_message['Subject'] = reply_subject
+            return {
+                "success": True,
+                "draft_id": draft['id'],
+                "message": f"Draft reply created successfully for message: {reply['original_subject']}",
+                "reply_to": reply["reply_to"],
+                "subject": reply["subject"]
+            }
             
-            # Add reference headers for threading
-            if message_id_header:
-                reply_message['In-Reply-To'] = message_id_header
-                reply_message['References'] = message_id_header
+        except HttpError as e:
+            return {
+                "success": False,
+                "error": f"Gmail API error: {str(e)}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to create draft reply: {str(e)}"
+            }
+    
+    def create_draft_replies(self, replies: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Create several draft replies, fetching the originals and creating the drafts in batch requests.
+        
+        Args:
+            replies: Dicts with message_id, reply_content and optional additional_recipients
             
-            # Add body
-            reply_message.attach(MIMEText(reply_content, 'plain'))
+        Returns:
+            Dictionary with one result entry per reply, in the given order
+        """
+        try:
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
-            # Encode message
-            raw_message = base64.urlsafe_b64encode(reply_message.as_bytes()).decode('utf-8')
+            service = self.gmail_auth_tool.service
             
-            # Create draft
-            draft_body = {
-                'message': {
-                    'raw': raw_message,
-                    'threadId': original_message['threadId']
+            # Only headers and the thread ID are needed, not the bodies
+            originals = _batch_get_messages(
+                self.gmail_auth_tool,
+                list(dict.fromkeys(reply['message_id'] for reply in replies)),
+                format='metadata',
+                metadataHeaders=REPLY_METADATA_HEADERS
+            )
+            built = [
+                self._build_reply(
+                    originals[reply['message_id']],
+                    reply.get('reply_content', ''),
+                    reply.get('additional_recipients', '')
+                )
+                for reply in replies
+            ]
+            
+            created: Dict[str, Any] = {}
+            
+            def collect(request_id, response, exception):
+                created[request_id] = exception if exception is not None else response
+            
+            # Draft creation isn't idempotent, so failed entries are reported rather than retried
+            for start in range(0, len(built), GMAIL_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=collect)
+                for index in range(start, min(start + GMAIL_BATCH_SIZE, len(built))):
+                    batch.add(
+                        service.users().drafts().create(userId='me', body=built[index]["draft_body"]),
+                        request_id=str(index)
+                    )
+                batch.execute()
+            
+            results = []
+            for index, (reply, draft_info) in enumerate(zip(replies, built, strict=True)):
+                outcome = created.get(str(index))
+                entry = {
+                    "message_id": reply['message_id'],
+                    "reply_to": draft_info["reply_to"],
+                    "subject": draft_info["subject"]
                 }
-            }
-            
-            draft = service.users().drafts().create(
-                userId='me', 
-                body=draft_body
-            ).execute()
+                if isinstance(outcome, dict):
+                    entry.update(success=True, draft_id=outcome['id'])
+                else:
+                    entry.update(success=False, error=f"Gmail API error: {str(outcome)}")
+                results.append(entry)
             
+            created_count = sum(1 for entry in results if entry["success"])
             return {
-                "success": True,
-                "draft_id": draft['id'],
-                "message": f"Draft reply created successfully for message: {original_subject}",
-                "reply_to": sender_email,
-                "subject": reply_subject
+                "success": created_count == len(results),
+                "drafts": results,
+                "count": created_count,
+                "message": f"Created {created_count} of {len(results)} draft replies"
             }
             
         except HttpError as e:
@@ -678,11 +1111,51 @@ class CreateDraftReplyTool(Tool):
         except Exception as e:
             return {
                 "success": False,
-                "error": f"Failed to create draft reply: {str(e)}"
+                "error": f"Failed to create draft replies: {str(e)}"
             }
+    
+    def _build_reply(self, original_message: Dict[str, Any], reply_content: str, additional_recipients: str) -> Dict[str, Any]:
+        """Build the drafts.create body replying to original_message, plus its subject and recipient."""
+        headers = _extract_headers(original_message['payload'], ('Subject', 'From', 'Message-ID'))
+        original_subject = headers.get('Subject', '')
+        sender_raw = headers.get('From', '')
+        sender_email = extract_email_address(sender_raw)
+        message_id_header = headers.get('Message-ID', '')
+        
+        # Create reply subject
+        reply_subject = original_subject if original_subject[:3] == 'Re:' else 'Re: ' + original_subject
+        
+        # Create reply message
+        # Plain-text message without attachments, so the headers are written directly
+        reply_message_headers = [('To', sender_email)]
+        
+        if additional_recipients:
+            reply_message_headers.append(('Cc', additional_recipients))
+        
+        reply_message_headers.append(('Subject', reply_subject))
+        
+        # Add reference headers for threading
+        if message_id_header:
+            reply_message_headers.append(('In-Reply-To', message_id_header))
+            reply_message_headers.append(('References', message_id_header))
+        
+        # Encode message
+        raw_message = _encode_plain_message(reply_message_headers, reply_content)
+        
+        return {
+            "draft_body": {
+                'message': {
+                    'raw': raw_message,
+                    'threadId': original_message['threadId']
+                }
+            },
+            "original_subject": original_subject,
+            "reply_to": sender_email,
+            "subject": reply_subject
+        }
 
 
-class AddDraftResponseTool(Tool):
+class AddDraftResponseTool(GmailTool):
     """Tool for adding a draft response to an email thread."""
     
     # Configure Pydantic to allow extra fields
@@ -704,21 +1177,21 @@ class AddDraftResponseTool(Tool):
     def execute(self, _parent_span_id=None, message_id: str = None, response_content: str = None, additional_recipients: str = "", custom_subject: str = "", **kwargs) -> Dict[str, Any]:
         """Create a draft response to an email."""
         try:
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             service = self.gmail_auth_tool.service
             
             # Get original message
-            original_message = service.users().messages().get(
-                userId='me', 
-                id=message_id, 
-                format='full'
-            ).execute()
+            # Only headers and the thread ID are needed, not the body
+            original_message = self.gmail_auth_tool.get_message(
+                message_id,
+                format='metadata',
+                metadataHeaders=REPLY_METADATA_HEADERS
+            )
             
-            headers = {h['name']: h['value'] for h in original_message['payload'].get('headers', [])}
+            headers = _extract_headers(original_message['payload'], ('Subject', 'From', 'Message-ID'))
             original_subject = headers.get('Subject', '')
             sender_raw = headers.get('From', '')
             sender_email = extract_email_address(sender_raw)
@@ -728,29 +1201,24 @@ class AddDraftResponseTool(Tool):
             if custom_subject:
                 response_subject = custom_subject
             else:
-                response_subject = original_subject
-                if not response_subject.startswith('Re:'):
-                    response_subject = f"Re: {response_subject}"
+                response_subject = original_subject if original_subject[:3] == 'Re:' else 'Re: ' + original_subject
             
             # Create response message
-            response_message = MIMEMultipart()
-            response_message['To'] = sender_email
+            # Plain-text message without attachments, so the headers are written directly
+            response_message_headers = [('To', sender_email)]
             
             if additional_recipients:
-                response_message['Cc'] = additional_recipients
+                response_message_headers.append(('Cc', additional_recipients))
             
-            response_message['Subject'] = response_subject
+            response_message_headers.append(('Subject', response_subject))
             
             # Add reference headers for threading
             if message_id_header:
-                response_message['In-Reply-To'] = message_id_header
-                response_message['References'] = message_id_header
-            
-            # Add body
-            response_message.attach(MIMEText(response_content, 'plain'))
+                response_message_headers.append(('In-Reply-To', message_id_header))
+                response_message_headers.append(('References', message_id_header))
             
             # Encode message
-            raw_message = base64.urlsafe_b64encode(response_message.as_bytes()).decode('utf-8')
+            raw_message = _encode_plain_message(response_message_headers, response_content)
             
             # Create draft
             draft_body = {
@@ -760,10 +1228,10 @@ class AddDraftResponseTool(Tool):
                 }
             }
             
-            draft = service.users().drafts().create(
+            draft = _with_backoff(service.users().drafts().create(
                 userId='me', 
                 body=draft_body
-            ).execute()
+            ), idempotent=False)
             
             return {
                 "success": True,
@@ -788,6 +1256,38 @@ class AddDraftResponseTool(Tool):
             }
 
 
+# Instructions for GenerateReplyContentTool; only the tone and context vary per call
+_REPLY_INSTRUCTIONS_TEMPLATE = """
+You are an AI assistant that analyzes emails and generates replies when appropriate.
+
+Your task is to:
+1. Categorize the email into one of these categories: 'meeting_request', 'project_update', 'question', 'complaint', 'sales_inquiry', 'support_request', 'social', 'other'
+2. Determine if the email needs a reply
+3. If it needs a reply, generate an appropriate response
+
+Email reply guidelines (when generating replies):
+- Use a {tone} tone
+- Be helpful and responsive to the sender's needs
+- Keep the reply concise but complete
+- Address the main points from the original email
+- Use proper email etiquette
+- Personalize the greeting using the sender's name
+- Do not include placeholder text like [Your Name] - leave signature lines generic
+- If specific information is requested that you cannot provide, politely indicate that you'll need to research it
+
+Additional context to consider: {context}
+
+Analyze the email and provide structured output with:
+- email_category: The category of the email
+- needs_reply: Whether this email requires a response
+- reply: The generated reply content (only if needs_reply is true, otherwise null)
+"""
+
+# Static pieces around the {tone} and {context} slots, joined per call without reformatting the text
+_REPLY_INSTRUCTIONS_HEAD, _REPLY_INSTRUCTIONS_REST = _REPLY_INSTRUCTIONS_TEMPLATE.split("{tone}")
+_REPLY_INSTRUCTIONS_MIDDLE, _REPLY_INSTRUCTIONS_TAIL = _REPLY_INSTRUCTIONS_REST.split("{context}")
+
+
 class GenerateReplyContentTool(Tool):
     """Tool for generating reply content using AI."""
     
@@ -817,31 +1317,13 @@ class GenerateReplyContentTool(Tool):
                 sender_name = kwargs.get('sender_name', '')
             
             # Prepare the AI prompt for structured email analysis
-            ai_instructions = f"""
-You are an AI assistant that analyzes emails and generates replies when appropriate.
-
-Your task is to:
-1. Categorize the email into one of these categories: 'meeting_request', 'project_update', 'question', 'complaint', 'sales_inquiry', 'support_request', 'social', 'other'
-2. Determine if the email needs a reply
-3. If it needs a reply, generate an appropriate response
-
-Email reply guidelines (when generating replies):
-- Use a {tone} tone
-- Be helpful and responsive to the sender's needs
-- Keep the reply concise but complete
-- Address the main points from the original email
-- Use proper email etiquette
-- Personalize the greeting using the sender's name
-- Do not include placeholder text like [Your Name] - leave signature lines generic
-- If specific information is requested that you cannot provide, politely indicate that you'll need to research it
-
-Additional context to consider: {context if context else "No additional context provided"}
-
-Analyze the email and provide structured output with:
-- email_category: The category of the email
-- needs_reply: Whether this email requires a response
-- reply: The generated reply content (only if needs_reply is true, otherwise null)
-"""
+            ai_instructions = "".join((
+                _REPLY_INSTRUCTIONS_HEAD,
+                tone,
+                _REPLY_INSTRUCTIONS_MIDDLE,
+                context if context else "No additional context provided",
+                _REPLY_INSTRUCTIONS_TAIL
+            ))
             
             # Prepare input data for the AI
             input_data = {
@@ -863,7 +1345,8 @@ Analyze the email and provide structured output with:
             
             # Extract the structured analysis
             if hasattr(ai_response, 'json_payload') and ai_response.json_payload:
-                analysis = EmailAnalysis(**ai_response.json_payload)
+                # Opper already enforced the output schema, so skip re-validating the payload
+                analysis = EmailAnalysis.model_construct(**ai_response.json_payload)
             elif isinstance(ai_response, dict):
                 analysis = EmailAnalysis(**ai_response)
             else:
@@ -885,9 +1368,8 @@ Analyze the email and provide structured output with:
             
         except Exception as e:
             # Fallback to a simple template if AI generation fails
-            sender_first_name = sender_name.split()[0] if sender_name else "there"
-            if '<' in sender_first_name:
-                sender_first_name = sender_first_name.split('<')[0].strip()
+            match = _FIRST_NAME_RE.match(sender_name or "")
+            sender_first_name = match.group(1) if match else "there"
             
             fallback_reply = f"""Hi {sender_first_name},
 
@@ -908,7 +1390,7 @@ Best regards"""
             }
 
 
-class AddEmailTagTool(Tool):
+class AddEmailTagTool(GmailTool):
     """Tool for adding labels/tags to Gmail messages."""
     
     # Configure Pydantic to allow extra fields
@@ -917,22 +1399,53 @@ class AddEmailTagTool(Tool):
     def __init__(self, gmail_auth_tool: GmailAuthTool):
         super().__init__(
             name="add_email_tag",
-            description="Add labels/tags to a Gmail message",
+            description="Add labels/tags to one or more Gmail messages",
             parameters={
-                "message_id": "str - Gmail message ID to add labels to",
+                "message_id": "str - Gmail message ID to add labels to, or a list of IDs to label them all at once",
                 "labels": "list - List of label names to add (e.g., ['work', 'urgent', 'follow-up'])",
-                "create_if_missing": "bool - Whether to create labels if they don't exist (default: True)"
+                "create_if_missing": "bool - Whether to create labels if they don't exist (default: True)",
+                "message_subject": "str - Optional subject of the message, as returned by list_emails/read_email; saves looking it up again"
             }
         )
         self.gmail_auth_tool = gmail_auth_tool
     
-    def execute(self, _parent_span_id=None, message_id: str = None, labels: List[str] = None, create_if_missing: bool = True, **kwargs) -> Dict[str, Any]:
-        """Add labels/tags to a Gmail message."""
+    def execute(self, _parent_span_id=None, message_id: Union[str, List[str]] = None, labels: List[str] = None, create_if_missing: bool = True, message_subject: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Add labels/tags to a Gmail message, or to several messages at once."""
+        if isinstance(message_id, list):
+            return self.add_labels_batch(message_id, labels, create_if_missing)
+        
+        result = self.add_labels_batch([message_id], labels, create_if_missing, message_subject=message_subject)
+        if not result["success"]:
+            return result
+        
+        message_info = result["messages"][0]
+        return {
+            "success": True,
+            "message_id": message_id,
+            "labels_added": result["labels_added"],
+            "labels_created": result["labels_created"],
+            "message_subject": message_info["message_subject"],
+            "total_labels_on_message": message_info["total_labels_on_message"],
+            "message": f"Successfully added {len(result['labels_added'])} label(s) to message: {message_info['message_subject']}"
+        }
+    
+    def add_labels_batch(self, message_ids: List[str], labels: List[str], create_if_missing: bool = True, message_subject: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add the same labels to several Gmail messages with as few API round trips as possible.
+        
+        Args:
+            message_ids: Gmail message IDs to label
+            labels: Label names to add
+            create_if_missing: Whether to create labels that don't exist yet
+            message_subject: Known subject when labelling a single message; skips the follow-up fetch
+            
+        Returns:
+            Dictionary with the labels added/created and per-message subject and label count
+        """
         try:
-            if not self.gmail_auth_tool.service:
-                auth_result = self.gmail_auth_tool.execute()
-                if not auth_result["success"]:
-                    return auth_result
+            auth_error = self._authenticate()
+            if auth_error:
+                return auth_error
             
             service = self.gmail_auth_tool.service
             
@@ -942,91 +1455,135 @@ class AddEmailTagTool(Tool):
                     "error": "No labels provided to add"
                 }
             
+            # Each message is labelled (and fetched) once, however often it was listed
+            message_ids = list(dict.fromkeys(message_ids or ()))
+            if not message_ids:
+                return {
+                    "success": False,
+                    "error": "No message IDs provided"
+                }
+            
             # Get existing labels to check which ones exist
-            existing_labels = service.users().labels().list(userId='me').execute()
-            existing_label_names = {label['name']: label['id'] for label in existing_labels.get('labels', [])}
+            existing_label_names = self.gmail_auth_tool.get_labels()
             
-            label_ids_to_add = []
-            labels_added = []
+            # Drop repeated names (keeping order) and resolve the existing ones up front
+            unique_labels = list(dict.fromkeys(labels))
+            missing_labels = [name for name in unique_labels if name not in existing_label_names]
+            if missing_labels and not create_if_missing:
+                return {
+                    "success": False,
+                    "error": f"Label '{missing_labels[0]}' does not exist and create_if_missing is False"
+                }
+
+            labels_added = [name for name in unique_labels if name in existing_label_names]
+            label_ids_to_add = [existing_label_names[name] for name in labels_added]
             labels_created = []
-            
-            for label_name in labels:
+
+            for label_name in missing_labels:
                 if label_name in existing_label_names:
-                    # Label exists, use its ID
+                    # Picked up by a forced label refresh below
                     label_ids_to_add.append(existing_label_names[label_name])
                     labels_added.append(label_name)
-                elif create_if_missing:
+                else:
                     # Create new label
                     try:
-                        new_label = service.users().labels().create(
+                        new_label = _with_backoff(service.users().labels().create(
                             userId='me',
                             body={
                                 'name': label_name,
                                 'labelListVisibility': 'labelShow',
                                 'messageListVisibility': 'show'
                             }
-                        ).execute()
+                        ), idempotent=False)
                         label_ids_to_add.append(new_label['id'])
                         labels_added.append(label_name)
                         labels_created.append(label_name)
+                        existing_label_names[label_name] = new_label['id']
                     except HttpError as e:
                         if "already exists" in str(e).lower():
                             # Label was created by another request, try to get it
-                            updated_labels = service.users().labels().list(userId='me').execute()
-                            updated_label_names = {label['name']: label['id'] for label in updated_labels.get('labels', [])}
-                            if label_name in updated_label_names:
-                                label_ids_to_add.append(updated_label_names[label_name])
+                            existing_label_names = self.gmail_auth_tool.get_labels(force=True)
+                            if label_name in existing_label_names:
+                                label_ids_to_add.append(existing_label_names[label_name])
                                 labels_added.append(label_name)
                         else:
                             return {
                                 "success": False,
                                 "error": f"Failed to create label '{label_name}': {str(e)}"
                             }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Label '{label_name}' does not exist and create_if_missing is False"
-                    }
-            
+
             if not label_ids_to_add:
                 return {
                     "success": False,
                     "error": "No valid labels to add"
                 }
             
-            # Add labels to the message
-            modify_request = {
-                'addLabelIds': label_ids_to_add
-            }
-            
-            result = service.users().messages().modify(
-                userId='me',
-                id=message_id,
-                body=modify_request
-            ).execute()
+            if len(message_ids) == 1 and message_subject is not None:
+                # modify already returns the new label IDs, and the caller knows the subject
+                modified = _with_backoff(service.users().messages().modify(
+                    userId='me',
+                    id=message_ids[0],
+                    body={'addLabelIds': label_ids_to_add},
+                    fields='labelIds'
+                ))
+                self.gmail_auth_tool.invalidate_message(message_ids[0])
+                return {
+                    "success": True,
+                    "labels_added": labels_added,
+                    "labels_created": labels_created,
+                    "messages": [{
+                        "message_id": message_ids[0],
+                        "message_subject": message_subject,
+                        "total_labels_on_message": len(modified.get('labelIds', []))
+                    }],
+                    "count": 1,
+                    "message": f"Successfully added {len(labels_added)} label(s) to 1 message(s)"
+                }
             
-            # Get updated message info
-            updated_message = service.users().messages().get(
-                userId='me',
-                id=message_id,
+            # Add labels to all messages, one batchModify call per chunk
+            for start in range(0, len(message_ids), GMAIL_BATCH_MODIFY_SIZE):
+                _with_backoff(service.users().messages().batchModify(
+                    userId='me',
+                    body={
+                        'ids': message_ids[start:start + GMAIL_BATCH_MODIFY_SIZE],
+                        'addLabelIds': label_ids_to_add
+                    }
+                ))
+            # Cached copies carry the old labels
+            for labelled_id in message_ids:
+                self.gmail_auth_tool.invalidate_message(labelled_id)
+            
+            # Get updated message info in batches, asking Gmail for only the fields read below
+            updated_messages = _batch_get_messages(
+                self.gmail_auth_tool,
+                message_ids,
                 format='metadata',
-                metadataHeaders=['Subject', 'From']
-            ).execute()
+                metadataHeaders=['Subject'],
+                fields='labelIds,payload/headers'
+            )
             
-            headers = {h['name']: h['value'] for h in updated_message['payload'].get('headers', [])}
-            subject = headers.get('Subject', 'No Subject')
+            messages_info = []
+            for labelled_id in message_ids:
+                updated_message = updated_messages[labelled_id]
+                headers = _extract_headers(updated_message['payload'], ('Subject',))
+                messages_info.append({
+                    "message_id": labelled_id,
+                    "message_subject": headers.get('Subject', 'No Subject'),
+                    "total_labels_on_message": len(updated_message.get('labelIds', []))
+                })
             
             return {
                 "success": True,
-                "message_id": message_id,
                 "labels_added": labels_added,
                 "labels_created": labels_created,
-                "message_subject": subject,
-                "total_labels_on_message": len(result.get('labelIds', [])),
-                "message": f"Successfully added {len(labels_added)} label(s) to message: {subject}"
+                "messages": messages_info,
+                "count": len(messages_info),
+                "message": f"Successfully added {len(labels_added)} label(s) to {len(messages_info)} message(s)"
             }
             
         except HttpError as e:
+            # A cached label may have been deleted meanwhile; list labels again next time
+            self.gmail_auth_tool.cached_labels = None
             return {
                 "success": False,
                 "error": f"Gmail API error: {str(e)}"
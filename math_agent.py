@@ -2,103 +2,57 @@
 Example agent working of opper base agent
 """
 
-from typing import Any, List, Dict
+import operator
+from typing import Any, Callable, List, Dict
 from pydantic import BaseModel, Field
 from base_agent import BaseAgent, Tool
 
 
-class AddTool(Tool):
-    """Addition tool for mathematical operations."""
-    
-    def __init__(self):
-        super().__init__(
-            name="add",
-            description="Adds two numbers together",
-            parameters={
-                "a": "float - The first number",
-                "b": "float - The second number"
-            }
-        )
-    
-    def execute(self, _parent_span_id=None, a: float = None, b: float = None, **kwargs) -> float:
-        """Execute the addition operation."""
-        # Handle both old and new calling conventions
-        if a is None:
-            a = kwargs.get('a', 0.0)
-        if b is None:
-            b = kwargs.get('b', 0.0)
-        return a + b
-
-
-class SubtractTool(Tool):
-    """Subtraction tool for mathematical operations."""
-    
-    def __init__(self):
-        super().__init__(
-            name="subtract",
-            description="Subtracts the second number from the first number",
-            parameters={
-                "a": "float - The number to subtract from",
-                "b": "float - The number to subtract"
-            }
-        )
-    
-    def execute(self, _parent_span_id=None, a: float = None, b: float = None, **kwargs) -> float:
-        """Execute the subtraction operation."""
-        # Handle both old and new calling conventions
-        if a is None:
-            a = kwargs.get('a', 0.0)
-        if b is None:
-            b = kwargs.get('b', 0.0)
-        return a - b
-
-
-class MultiplyTool(Tool):
-    """Multiplication tool for mathematical operations."""
-    
-    def __init__(self):
-        super().__init__(
-            name="multiply",
-            description="Multiplies two numbers together",
-            parameters={
-                "a": "float - The first number",
-                "b": "float - The second number"
-            }
-        )
+def _divide(a: float, b: float) -> float:
+    """Divide a by b, refusing a zero divisor."""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+# Tool name -> (operation, description, description of a, description of b)
+_OPS = {
+    "add": (operator.add, "Adds two numbers together", "The first number", "The second number"),
+    "subtract": (operator.sub, "Subtracts the second number from the first number", "The number to subtract from", "The number to subtract"),
+    "multiply": (operator.mul, "Multiplies two numbers together", "The first number", "The second number"),
+    "divide": (_divide, "Divides the first number by the second number", "The dividend (number to be divided)", "The divisor (number to divide by)"),
+}
+
+
+class BinaryOpTool(Tool):
+    """Tool applying a two-operand arithmetic operation."""
     
-    def execute(self, _parent_span_id=None, a: float = None, b: float = None, **kwargs) -> float:
-        """Execute the multiplication operation."""
-        # Handle both old and new calling conventions
-        if a is None:
-            a = kwargs.get('a', 0.0)
-        if b is None:
-            b = kwargs.get('b', 0.0)
-        return a * b
-
-
-class DivideTool(Tool):
-    """Division tool for mathematical operations."""
+    # Configure Pydantic to allow extra fields
+    model_config = {"extra": "allow"}
     
-    def __init__(self):
+    def __init__(self, name: str, operation: Callable[[float, float], float], description: str, a_description: str, b_description: str):
         super().__init__(
-            name="divide",
-            description="Divides the first number by the second number",
+            name=name,
+            description=description,
             parameters={
-                "a": "float - The dividend (number to be divided)",
-                "b": "float - The divisor (number to divide by)"
+                "a": f"float - {a_description}",
+                "b": f"float - {b_description}"
             }
         )
+        self.operation = operation
     
-    def execute(self, _parent_span_id=None, a: float = None, b: float = None, **kwargs) -> float:
-        """Execute the division operation."""
-        # Handle both old and new calling conventions
-        if a is None:
-            a = kwargs.get('a', 0.0)
-        if b is None:
-            b = kwargs.get('b', 0.0)
-        if b == 0:
-            raise ValueError("Cannot divide by zero")
-        return a / b
+    def execute(self, _parent_span_id=None, a: float = 0.0, b: float = 0.0, **kwargs) -> float:
+        """Execute the operation."""
+        return self.operation(a, b)
+
+
+def get_math_tools() -> List[BinaryOpTool]:
+    """Create the add, subtract, multiply and divide tools."""
+    return [BinaryOpTool(name, *spec) for name, spec in _OPS.items()]
+
+
+# Shared tool instances; they hold no per-agent state, so every agent can reuse them
+MATH_TOOLS = get_math_tools()
 
 
 class MathProblemInput(BaseModel):
@@ -161,20 +115,13 @@ def main():
         
         description = "An agent that solves mathematical problems using calculation tools and logical reasoning."
 
-        math_tools = [
-            AddTool(),
-            SubtractTool(), 
-            MultiplyTool(),
-            DivideTool()
-        ]
-        
         agent = BaseAgent(
             name="MathAgent",
             opper_api_key=api_key,
             callback=print_status,
             verbose=False,
             output_schema=MathSolution,
-            tools=math_tools,
+            tools=list(MATH_TOOLS),
             description=description,
         )
 
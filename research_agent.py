@@ -4,26 +4,341 @@ Deep Research Agent for comprehensive web research and analysis.
 
 import os
 import re
+import hashlib
+import html
 import json
-from typing import Any, List, Dict, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Any, List, Dict, Optional, Tuple
 from pydantic import BaseModel, Field
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlencode, urlsplit, urlunsplit, parse_qsl
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 
+try:
+    import lxml.html as lxml_html
+    from lxml.etree import ParserError as LxmlParserError
+    HTML_PARSER = "lxml"
+except ImportError:  # Optional: C-backed HTML parsing, several times faster than html.parser
+    lxml_html = None
+    LxmlParserError = None
+    HTML_PARSER = "html.parser"
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # Optional: compiled CSS-selector extraction of search results
+    SelectolaxParser = None
+
 from base_agent import BaseAgent, Tool
 
 
+# Browser User-Agent sent with every search and content request
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# DuckDuckGo endpoints and the fixed Instant Answer API parameters; pretty-printing is
+# left off since nobody reads the raw JSON
+DDG_BASE_URL = "https://duckduckgo.com"
+DDG_API_URL = "https://api.duckduckgo.com/"
+DDG_HTML_URL = "https://html.duckduckgo.com/html/"
+DDG_API_PARAMS = {
+    "format": "json",
+    "no_redirect": "1",
+    "no_html": "1",
+    "skip_disambig": "1"
+}
+
+# Only the start of a page is downloaded and parsed; the analysis reads at most 8000
+# characters of its text anyway
+MAX_PAGE_BYTES = 512 * 1024
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid"})
+
+# Source fields holding page text or markup, cut to SYNTHESIS_SNIPPET_CHARS in the
+# synthesis prompt; any other string field of a source is cut to SYNTHESIS_FIELD_CHARS
+SYNTHESIS_BULKY_KEYS = frozenset({"content", "text", "html", "snippet"})
+SYNTHESIS_SNIPPET_CHARS = 500
+SYNTHESIS_FIELD_CHARS = 4000
+
+# Pages fetched and analyzed at once when analyze_content is given several URLs
+CONTENT_FETCH_WORKERS = 10
+
+
+# Successful results kept per tool, so repeated searches and analyses during one
+# research session skip the HTTP and AI calls
+SEARCH_CACHE_SIZE = 128
+CONTENT_CACHE_SIZE = 128
+CONTENT_CACHE_TTL = 3600.0  # seconds; pages change, search results are only reused per session
+
+# DuckDuckGo HTML result markup: title anchors, snippet anchors, href attribute and inner tags
+_RESULT_LINK_RE = re.compile(rb'<a\s[^>]*class="[^"]*\bresult__a\b[^"]*"[^>]*>(.*?)</a>', re.S)
+_RESULT_SNIPPET_RE = re.compile(rb'<a\s[^>]*class="[^"]*\bresult__snippet\b[^"]*"[^>]*>(.*?)</a>', re.S)
+_HREF_RE = re.compile(rb'\shref="([^"]*)"')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Parse only the parts of a page each tool reads
+SEARCH_RESULT_STRAINER = SoupStrainer('div', class_='result')
+PAGE_CONTENT_STRAINER = SoupStrainer(['title', 'body'])
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a requests session with keep-alive connection pooling and light retries.
+    
+    Reusing one session per tool avoids a new TCP + TLS handshake on every request
+    to the same host.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def declared_encoding(response: requests.Response) -> Optional[str]:
+    """Return the charset named in the Content-Type header, so the parser can skip detection."""
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        return response.encoding
+    return None
+
+
+def read_capped(response: requests.Response, limit: int = MAX_PAGE_BYTES) -> bytes:
+    """Read at most limit bytes of a streamed response body, then release the connection."""
+    buffer = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=16384):
+            buffer += chunk
+            if len(buffer) >= limit:
+                break
+    finally:
+        response.close()
+    return bytes(buffer[:limit])
+
+
+def extract_page_text(content: bytes, encoding: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Extract the title and the visible text of a fetched HTML page.
+    
+    Args:
+        content: Raw page bytes
+        encoding: Charset declared by the server, if any
+        
+    Returns:
+        (title, text) with scripts and styles removed and whitespace runs collapsed
+        to single spaces (str.split/join does this in one C-level pass)
+    """
+    if not content.strip():
+        # Empty 200 response; lxml refuses to parse an empty document
+        return "No title found", ""
+    
+    if lxml_html is not None:
+        # Fast path: the whole pipeline runs inside libxml2
+        try:
+            parser = lxml_html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # Charset the server made up; let libxml2 detect the encoding itself
+            parser = lxml_html.HTMLParser()
+        try:
+            tree = lxml_html.fromstring(content, parser=parser)
+        except LxmlParserError:
+            # "Document is empty": only a doctype, comments or whitespace
+            return "No title found", ""
+        for element in tree.xpath('//script|//style'):
+            element.drop_tree()
+        title = (tree.findtext('.//title') or "").strip()
+        text = ' '.join(tree.text_content().split())
+        return title or "No title found", text
+    
+    # Parse the content, skipping head assets outside <title>
+    soup = BeautifulSoup(content, HTML_PARSER, from_encoding=encoding,
+                         parse_only=PAGE_CONTENT_STRAINER)
+    if soup.find('body') is None:
+        # Fragment without a <body> tag (html.parser doesn't add one), parse it all
+        soup = BeautifulSoup(content, HTML_PARSER, from_encoding=encoding)
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    title_elem = soup.find('title')
+    title = title_elem.get_text(strip=True) if title_elem else "No title found"
+    text = ' '.join(soup.get_text().split())
+    return title, text
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to the form used for caching and deduplication.
+    
+    Drops the fragment, utm_* and other tracking parameters and a trailing slash,
+    and lowercases the scheme and host, so trivially different links to the same
+    page share one cache entry. The original URL is still the one fetched.
+    """
+    if not url:
+        return url
+    
+    parts = urlsplit(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class ResultCache:
+    """Bounded least-recently-used cache of tool results, with an optional time-to-live."""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (stored_at, result)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+    
+    def put(self, key: tuple, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def compact_research_data(research_data: Any) -> Any:
+    """
+    Shrink research data before it goes into the synthesis prompt.
+    
+    A source entry is a dict with a url, found inside a list or a nested dict (the
+    top-level research_data is never treated as one). Its bulky page fields (content,
+    text, html, snippet) are cut down to a short excerpt and any other long string
+    is truncated; every key is kept. Sources repeated under another URL form are
+    dropped, and text that already appeared for another source is not repeated.
+    Everything outside source entries is kept as is.
+    
+    Args:
+        research_data: Research findings as passed to synthesize_research
+        
+    Returns:
+        The same structure with source entries compacted and deduplicated
+    """
+    seen_urls = set()
+    seen_texts = set()
+    
+    def compact_source(value: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        url_key = canonicalize_url(value["url"])
+        if url_key in seen_urls:
+            return None
+        seen_urls.add(url_key)
+        
+        entry = {}
+        for key, item in value.items():
+            if isinstance(item, str):
+                limit = SYNTHESIS_SNIPPET_CHARS if key in SYNTHESIS_BULKY_KEYS else SYNTHESIS_FIELD_CHARS
+                item = item[:limit]
+                if key in SYNTHESIS_BULKY_KEYS or key == "analysis":
+                    # Mirrors and syndicated copies carry the same text under another URL
+                    text_key = hashlib.sha1(item.strip().encode("utf-8")).digest()
+                    if text_key in seen_texts:
+                        continue
+                    seen_texts.add(text_key)
+            else:
+                item = compact(item)
+            entry[key] = item
+        return entry
+    
+    def compact(value, root: bool = False):
+        if isinstance(value, dict):
+            if not root and isinstance(value.get("url"), str) and value["url"]:
+                return compact_source(value)
+            compacted = {key: compact(item) for key, item in value.items()}
+            return {key: item for key, item in compacted.items() if item is not None}
+        if isinstance(value, list):
+            return [item for item in map(compact, value) if item is not None]
+        return value
+    
+    return compact(research_data, root=True)
+
+
+def _markup_text(fragment: bytes) -> str:
+    """Plain text of an HTML fragment: tags dropped, entities decoded, whitespace collapsed."""
+    text = html.unescape(_TAG_RE.sub('', fragment.decode('utf-8', 'replace')))
+    return ' '.join(text.split())
+
+
+def extract_search_results(content: bytes, max_results: int) -> List[Tuple[str, str, str]]:
+    """
+    Pull (title, href, snippet) out of a DuckDuckGo HTML results page with regexes.
+    
+    The page layout is fixed and simple, so this skips building a DOM. A snippet is
+    only taken from between its own title link and the next one.
+    
+    Args:
+        content: Raw results page
+        max_results: Maximum number of results to extract
+        
+    Returns:
+        The extracted results; empty if the markup didn't match
+    """
+    links = []
+    for match in _RESULT_LINK_RE.finditer(content):
+        links.append(match)
+        if len(links) > max_results:
+            break
+    
+    entries = []
+    for index, link in enumerate(links[:max_results]):
+        end = links[index + 1].start() if index + 1 < len(links) else len(content)
+        start_tag = content[link.start():content.index(b'>', link.start()) + 1]
+        href = _HREF_RE.search(start_tag)
+        snippet = _RESULT_SNIPPET_RE.search(content, link.end(), end)
+        entries.append((
+            _markup_text(link.group(1)),
+            html.unescape(href.group(1).decode('utf-8', 'replace')) if href else '',
+            _markup_text(snippet.group(1)) if snippet else ""
+        ))
+    return entries
+
+
+@lru_cache(maxsize=4096)
+def url_host(url: str) -> str:
+    """Network location of a URL; cached since the same links recur throughout a session."""
+    return urlparse(url).netloc
+
+
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     """Normalize URL to ensure it has a proper protocol."""
     if not url:
         return url
     
-    if url.startswith('//'):
-        return 'https:' + url
-    elif url.startswith('/'):
-        return 'https://duckduckgo.com' + url
+    if url[0] == '/':
+        # Protocol-relative ('//host/...') or a DuckDuckGo-relative path
+        return ('https:' if url[:2] == '//' else DDG_BASE_URL) + url
     
     return url
 
@@ -44,32 +359,26 @@ class WebSearchTool(Tool):
                 "search_type": "str - Type of search: 'general', 'news', 'academic' (default: 'general')"
             }
         )
+        self.session = create_http_session()
+        self.result_cache = ResultCache(SEARCH_CACHE_SIZE)
     
     def execute(self, _parent_span_id=None, query: str = None, max_results: int = 5, search_type: str = "general", **kwargs) -> Dict[str, Any]:
         """Perform a web search and return results."""
         try:
-            if not query:
+            if not query or not query.strip():
                 return {
                     "success": False,
                     "error": "No search query provided"
                 }
             
-            # Use DuckDuckGo Instant Answer API (free, no key required)
-            search_url = "https://api.duckduckgo.com/"
-            params = {
-                "q": query,
-                "format": "json",
-                "pretty": "1",
-                "no_redirect": "1",
-                "no_html": "1",
-                "skip_disambig": "1"
-            }
+            # Searches differing only in case or spacing return the same results
+            cache_key = (" ".join(query.lower().split()), max_results, search_type)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
             
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            response = requests.get(search_url, params=params, headers=headers, timeout=10)
+            # Use DuckDuckGo Instant Answer API (free, no key required)
+            response = self.session.get(DDG_API_URL, params={"q": query, **DDG_API_PARAMS}, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -87,15 +396,19 @@ class WebSearchTool(Tool):
                 })
             
             # Extract related topics
-            for topic in data.get("RelatedTopics", [])[:max_results-len(results)]:
-                if isinstance(topic, dict) and "Text" in topic:
-                    results.append({
-                        "title": topic.get("Result", topic.get("Text", ""))[:100] + "...",
-                        "url": normalize_url(topic.get("FirstURL", "")),
-                        "snippet": topic.get("Text", ""),
-                        "source": "DuckDuckGo Related",
-                        "type": "related_topic"
-                    })
+            topics = (
+                topic for topic in data.get("RelatedTopics", ())
+                if isinstance(topic, dict) and "Text" in topic
+            )
+            for topic in islice(topics, max(max_results - len(results), 0)):
+                text = topic["Text"]
+                results.append({
+                    "title": topic.get("Result", text)[:100] + "...",
+                    "url": normalize_url(topic.get("FirstURL", "")),
+                    "snippet": text,
+                    "source": "DuckDuckGo Related",
+                    "type": "related_topic"
+                })
             
             # If we don't have enough results, try a different approach
             if len(results) < 2:
@@ -107,13 +420,13 @@ class WebSearchTool(Tool):
                     # If scraping fails, add at least a basic result
                     results.append({
                         "title": f"Search Results for: {query}",
-                        "url": f"https://duckduckgo.com/?q={query.replace(' ', '+')}",
+                        "url": f"{DDG_BASE_URL}/?{urlencode({'q': query})}",
                         "snippet": f"Search performed for '{query}'. Consider using more specific terms or checking multiple sources.",
                         "source": "Search Engine",
                         "type": "search_link"
                     })
             
-            return {
+            result = {
                 "success": True,
                 "query": query,
                 "results": results[:max_results],
@@ -121,6 +434,8 @@ class WebSearchTool(Tool):
                 "search_type": search_type,
                 "message": f"Found {len(results)} results for '{query}'"
             }
+            self.result_cache.put(cache_key, result)
+            return result
             
         except requests.RequestException as e:
             return {
@@ -139,35 +454,46 @@ class WebSearchTool(Tool):
         """Fallback method to scrape search results."""
         try:
             # This is a simple fallback - in production, you'd want to use proper search APIs
-            search_url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = self.session.get(DDG_HTML_URL, params={"q": query}, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            results = []
+            # (title, href, snippet) of each result; the DOM parsers are only a
+            # backstop for when the markup changes and the regexes find nothing
+            entries = extract_search_results(response.content, max_results)
+            if not entries and SelectolaxParser is not None:
+                tree = SelectolaxParser(response.content)
+                for result in tree.css('div.result')[:max_results]:
+                    title_elem = result.css_first('a.result__a')
+                    snippet_elem = result.css_first('a.result__snippet')
+                    if title_elem:
+                        entries.append((
+                            title_elem.text(strip=True),
+                            title_elem.attributes.get('href') or '',
+                            snippet_elem.text(strip=True) if snippet_elem else ""
+                        ))
+            elif not entries:
+                soup = BeautifulSoup(response.content, HTML_PARSER, from_encoding=declared_encoding(response),
+                                     parse_only=SEARCH_RESULT_STRAINER)
+                for result in soup.find_all('div', class_='result')[:max_results]:
+                    title_elem = result.find('a', class_='result__a')
+                    snippet_elem = result.find('a', class_='result__snippet')
+                    if title_elem:
+                        entries.append((
+                            title_elem.get_text(strip=True),
+                            title_elem.get('href', ''),
+                            snippet_elem.get_text(strip=True) if snippet_elem else ""
+                        ))
             
-            # Extract search results (this is a simplified approach)
-            for result in soup.find_all('div', class_='result')[:max_results]:
-                title_elem = result.find('a', class_='result__a')
-                snippet_elem = result.find('a', class_='result__snippet')
-                
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = normalize_url(title_elem.get('href', ''))
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                    
-                    results.append({
-                        "title": title,
-                        "url": url,
-                        "snippet": snippet,
-                        "source": urlparse(url).netloc if url else "Unknown",
-                        "type": "web_result"
-                    })
+            results = []
+            for title, href, snippet in entries:
+                url = normalize_url(href)
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "snippet": snippet,
+                    "source": url_host(url) if url else "Unknown",
+                    "type": "web_result"
+                })
             
             return results
             
@@ -175,6 +501,65 @@ class WebSearchTool(Tool):
             return []
 
 
+# Instructions per analysis_type, built once; {focus_clause} is filled per call
+_ANALYSIS_INSTRUCTIONS = {
+    "summary": """You are a content analysis expert. Analyze the provided web content and provide insights.
+            
+            Provide a concise summary of the main content. Focus on:
+            - Key topics and themes
+            - Main arguments or findings
+            - Important conclusions
+            
+            {focus_clause}
+            
+            Keep the summary clear and factual.""",
+    "facts": """You are a content analysis expert. Analyze the provided web content and provide insights.
+            
+            Extract key facts and data points from the content. Focus on:
+            - Specific statistics, numbers, and data
+            - Verifiable claims and statements
+            - Important dates, names, and places
+            - Research findings or study results
+            
+            {focus_clause}
+            
+            Present facts in a clear, organized manner.""",
+    "key_points": """You are a content analysis expert. Analyze the provided web content and provide insights.
+            
+            Identify and extract the key points from the content. Focus on:
+            - Main arguments or positions
+            - Important conclusions or recommendations
+            - Significant developments or changes
+            - Critical insights or observations
+            
+            {focus_clause}
+            
+            Organize the points in order of importance.""",
+    "comprehensive": """You are a content analysis expert. Analyze the provided web content and provide insights.
+            
+            Provide a comprehensive analysis including:
+            1. Summary of main content and themes
+            2. Key facts and data points
+            3. Important arguments or findings
+            4. Notable quotes or statements
+            5. Credibility assessment of the source
+            6. Potential biases or limitations
+            7. Relevance and reliability for research purposes
+            
+            {focus_clause}
+            
+            Structure your analysis clearly with distinct sections.""",
+}
+
+# Lead-in of the focus sentence per analysis_type
+_ANALYSIS_FOCUS_PREFIXES = {
+    "summary": "Pay special attention to information related to: ",
+    "facts": "Prioritize facts related to: ",
+    "key_points": "Emphasize points related to: ",
+    "comprehensive": "Pay special attention to aspects related to: ",
+}
+
+
 class ContentAnalysisTool(Tool):
     """Tool for analyzing and summarizing web content."""
     
@@ -188,13 +573,75 @@ class ContentAnalysisTool(Tool):
             parameters={
                 "url": "str - The URL to fetch and analyze",
                 "analysis_type": "str - Type of analysis: 'summary', 'facts', 'key_points', 'comprehensive' (default: 'comprehensive')",
-                "focus_area": "str - Specific area to focus analysis on (optional)"
+                "focus_area": "str - Specific area to focus analysis on (optional)",
+                "urls": "list - Several URLs to fetch and analyze concurrently instead of a single url (optional)"
             }
         )
         self.opper = opper_client
+        self.session = create_http_session()
+        self.result_cache = ResultCache(CONTENT_CACHE_SIZE, ttl=CONTENT_CACHE_TTL)
+        # Analyses keyed by a digest of the page text, shared by mirrors and syndicated copies
+        self.analysis_cache = ResultCache(CONTENT_CACHE_SIZE, ttl=CONTENT_CACHE_TTL)
+        # ETag / Last-Modified of analyzed pages with their result, kept past the result
+        # cache's TTL so an unchanged page can be revalidated with a bodyless 304
+        self.revalidation_cache = ResultCache(CONTENT_CACHE_SIZE)
     
-    def execute(self, _parent_span_id=None, url: str = None, analysis_type: str = "comprehensive", focus_area: str = "", **kwargs) -> Dict[str, Any]:
-        """Fetch and analyze content from a URL."""
+    def execute(self, _parent_span_id=None, url: str = None, analysis_type: str = "comprehensive", focus_area: str = "", urls: List[str] = None, **kwargs) -> Dict[str, Any]:
+        """Fetch and analyze content from a URL, or from several URLs at once."""
+        if isinstance(urls, str):
+            # A single URL passed as urls, not a list of its characters
+            urls = [urls]
+        if urls:
+            return self.analyze_batch(urls, analysis_type, focus_area, _parent_span_id)
+        return self._analyze_url(url, analysis_type, focus_area, _parent_span_id)
+    
+    def analyze_batch(self, urls: List[str], analysis_type: str = "comprehensive", focus_area: str = "", parent_span_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch and analyze several URLs concurrently.
+        
+        Args:
+            urls: URLs to fetch and analyze
+            analysis_type: Type of analysis applied to every page
+            focus_area: Specific area to focus analysis on
+            parent_span_id: Parent span for tracing the analysis calls
+            
+        Returns:
+            Dictionary with one analysis result per distinct page, in the order the pages
+            first appear; empty URLs and links that canonicalize to an earlier one are
+            skipped, and "urls" lists the URL analyzed for each result. A URL that fails
+            to fetch or analyze gets its own error entry without affecting the rest.
+        """
+        # One fetch per page, however many trivially different links point at it
+        by_canonical: Dict[str, str] = {}
+        for url in urls:
+            if url:
+                by_canonical.setdefault(canonicalize_url(url), url)
+        unique_urls = list(by_canonical.values())
+        if not unique_urls:
+            return {
+                "success": False,
+                "error": "No URLs provided for analysis"
+            }
+        
+        workers = min(CONTENT_FETCH_WORKERS, len(unique_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda page_url: self._analyze_url(page_url, analysis_type, focus_area, parent_span_id),
+                unique_urls
+            ))
+        
+        succeeded = sum(1 for result in results if result.get("success"))
+        return {
+            "success": succeeded > 0,
+            "urls": unique_urls,
+            "results": results,
+            "count": len(results),
+            "analysis_type": analysis_type,
+            "message": f"Analyzed {succeeded} of {len(results)} URL(s)"
+        }
+    
+    def _analyze_url(self, url: str, analysis_type: str, focus_area: str, parent_span_id: Optional[str]) -> Dict[str, Any]:
+        """Fetch and analyze content from a single URL."""
         try:
             if not url:
                 return {
@@ -202,67 +649,76 @@ class ContentAnalysisTool(Tool):
                     "error": "No URL provided for analysis"
                 }
             
-            # Fetch the content
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Parse the content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            cache_key = (canonicalize_url(url), analysis_type, focus_area)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
             
-            # Extract text content
-            text = soup.get_text()
+            # Ask the server to skip the body if the page hasn't changed since its last analysis
+            validators = self.revalidation_cache.get(cache_key)
+            conditional_headers = {}
+            if validators is not None:
+                if validators["etag"]:
+                    conditional_headers["If-None-Match"] = validators["etag"]
+                if validators["last_modified"]:
+                    conditional_headers["If-Modified-Since"] = validators["last_modified"]
             
-            # Clean up the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # Fetch the content
+            # Streamed so oversized pages stop downloading once the cap is reached
+            response = self.session.get(url, timeout=15, stream=True, headers=conditional_headers)
+            if response.status_code == 304 and validators is not None:
+                response.close()
+                self.result_cache.put(cache_key, validators["result"])
+                return {**validators["result"], "cached": True}
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                response.close()
+                raise
+            
+            title, text = extract_page_text(read_capped(response), declared_encoding(response))
             
             # Limit text length for AI processing
             if len(text) > 8000:
                 text = text[:8000] + "..."
             
-            # Extract title
-            title_elem = soup.find('title')
-            title = title_elem.get_text(strip=True) if title_elem else "No title found"
-            
-            # Prepare AI analysis
-            analysis_instructions = self._get_analysis_instructions(analysis_type, focus_area)
-            
-            input_data = {
-                "url": url,
-                "title": title,
-                "content": text,
-                "analysis_type": analysis_type,
-                "focus_area": focus_area
-            }
-            
-            # Call AI for content analysis with proper tracing
-            ai_response = self.make_ai_call(
-                opper_client=self.opper,
-                name="analyze_web_content",
-                instructions=analysis_instructions,
-                input_data=input_data,
-                parent_span_id=_parent_span_id,
-                model="openai/gpt-5-mini"
-            )
-            
-            # Extract analysis result
-            if hasattr(ai_response, 'message') and hasattr(ai_response.message, 'content'):
-                analysis_result = ai_response.message.content
-            elif hasattr(ai_response, 'content'):
-                analysis_result = ai_response.content
+            # The same text reached through another URL was analyzed already
+            content_key = (hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), analysis_type, focus_area)
+            cached_analysis = self.analysis_cache.get(content_key)
+            if cached_analysis is not None:
+                analysis_result = cached_analysis["analysis"]
             else:
-                analysis_result = str(ai_response)
-            
-            return {
+                # Prepare AI analysis
+                analysis_instructions = self._get_analysis_instructions(analysis_type, focus_area)
+                
+                input_data = {
+                    "url": url,
+                    "title": title,
+                    "content": text,
+                    "analysis_type": analysis_type,
+                    "focus_area": focus_area
+                }
+                
+                # Call AI for content analysis with proper tracing
+                ai_response = self.make_ai_call(
+                    opper_client=self.opper,
+                    name="analyze_web_content",
+                    instructions=analysis_instructions,
+                    input_data=input_data,
+                    parent_span_id=parent_span_id,
+                    model="openai/gpt-5-mini"
+                )
+                
+                # Extract analysis result
+                if hasattr(ai_response, 'message') and hasattr(ai_response.message, 'content'):
+                    analysis_result = ai_response.message.content
+                elif hasattr(ai_response, 'content'):
+                    analysis_result = ai_response.content
+                else:
+                    analysis_result = str(ai_response)
+                self.analysis_cache.put(content_key, {"analysis": analysis_result})
+            
+            result = {
                 "success": True,
                 "url": url,
                 "title": title,
@@ -270,8 +726,14 @@ class ContentAnalysisTool(Tool):
                 "analysis_type": analysis_type,
                 "analysis": analysis_result,
                 "focus_area": focus_area if focus_area else "general",
-                "message": f"Successfully analyzed content from {urlparse(url).netloc}"
+                "message": f"Successfully analyzed content from {url_host(url)}"
             }
+            self.result_cache.put(cache_key, result)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.revalidation_cache.put(cache_key, {"etag": etag, "last_modified": last_modified, "result": result})
+            return result
             
         except requests.RequestException as e:
             return {
@@ -288,61 +750,45 @@ class ContentAnalysisTool(Tool):
     
     def _get_analysis_instructions(self, analysis_type: str, focus_area: str) -> str:
         """Get analysis instructions based on the type of analysis requested."""
-        base_instruction = "You are a content analysis expert. Analyze the provided web content and provide insights."
-        
-        if analysis_type == "summary":
-            return f"""{base_instruction}
-            
-            Provide a concise summary of the main content. Focus on:
-            - Key topics and themes
-            - Main arguments or findings
-            - Important conclusions
-            
-            {f"Pay special attention to information related to: {focus_area}" if focus_area else ""}
-            
-            Keep the summary clear and factual."""
-            
-        elif analysis_type == "facts":
-            return f"""{base_instruction}
-            
-            Extract key facts and data points from the content. Focus on:
-            - Specific statistics, numbers, and data
-            - Verifiable claims and statements
-            - Important dates, names, and places
-            - Research findings or study results
-            
-            {f"Prioritize facts related to: {focus_area}" if focus_area else ""}
-            
-            Present facts in a clear, organized manner."""
-            
-        elif analysis_type == "key_points":
-            return f"""{base_instruction}
-            
-            Identify and extract the key points from the content. Focus on:
-            - Main arguments or positions
-            - Important conclusions or recommendations
-            - Significant developments or changes
-            - Critical insights or observations
+        if analysis_type not in _ANALYSIS_INSTRUCTIONS:
+            analysis_type = "comprehensive"
+        focus_clause = f"{_ANALYSIS_FOCUS_PREFIXES[analysis_type]}{focus_area}" if focus_area else ""
+        return _ANALYSIS_INSTRUCTIONS[analysis_type].format(focus_clause=focus_clause)
+
+
+# Instructions per verification_level, built once
+_VERIFICATION_INSTRUCTIONS = {
+    "basic": """You are a fact-checking expert. Analyze the provided claim and assess its accuracy.
             
-            {f"Emphasize points related to: {focus_area}" if focus_area else ""}
+            Provide a basic fact-check assessment:
+            - Is the claim plausible based on general knowledge?
+            - Are there any obvious inconsistencies or red flags?
+            - What is the general likelihood of accuracy?
             
-            Organize the points in order of importance."""
+            Provide a simple assessment: TRUE, FALSE, PARTIALLY TRUE, or INSUFFICIENT INFORMATION.""",
+    "academic": """You are a fact-checking expert. Analyze the provided claim and assess its accuracy.
             
-        else:  # comprehensive
-            return f"""{base_instruction}
+            Provide an academic-level fact verification:
+            - Assess the claim against established academic knowledge
+            - Identify what types of sources would be needed for verification
+            - Evaluate the specificity and verifiability of the claim
+            - Consider the methodology that would be required to prove/disprove
+            - Assess potential confounding factors or limitations
             
-            Provide a comprehensive analysis including:
-            1. Summary of main content and themes
-            2. Key facts and data points
-            3. Important arguments or findings
-            4. Notable quotes or statements
-            5. Credibility assessment of the source
-            6. Potential biases or limitations
-            7. Relevance and reliability for research purposes
+            Provide a detailed academic assessment with confidence levels and research recommendations.""",
+    "thorough": """You are a fact-checking expert. Analyze the provided claim and assess its accuracy.
             
-            {f"Pay special attention to aspects related to: {focus_area}" if focus_area else ""}
+            Provide a thorough fact-checking analysis:
+            1. Break down the claim into verifiable components
+            2. Assess each component for accuracy and consistency
+            3. Identify what evidence would support or refute the claim
+            4. Consider alternative explanations or interpretations
+            5. Evaluate the credibility and reliability of any sources
+            6. Provide an overall assessment with confidence level
+            7. Suggest additional verification steps if needed
             
-            Structure your analysis clearly with distinct sections."""
+            Structure your analysis clearly and provide a final verdict: TRUE, FALSE, PARTIALLY TRUE, or NEEDS MORE RESEARCH.""",
+}
 
 
 class FactVerificationTool(Tool):
@@ -418,43 +864,55 @@ class FactVerificationTool(Tool):
     
     def _get_verification_instructions(self, verification_level: str) -> str:
         """Get verification instructions based on the level of verification requested."""
-        base_instruction = "You are a fact-checking expert. Analyze the provided claim and assess its accuracy."
-        
-        if verification_level == "basic":
-            return f"""{base_instruction}
+        return _VERIFICATION_INSTRUCTIONS.get(verification_level, _VERIFICATION_INSTRUCTIONS["thorough"])
+
+
+# Instructions per report_style, built once
+_SYNTHESIS_INSTRUCTIONS = {
+    "executive_summary": """You are a research synthesis expert. Analyze the provided research data and create a comprehensive report.
             
-            Provide a basic fact-check assessment:
-            - Is the claim plausible based on general knowledge?
-            - Are there any obvious inconsistencies or red flags?
-            - What is the general likelihood of accuracy?
+            Create an executive summary that includes:
+            - Key findings and conclusions (bullet points)
+            - Main insights and trends identified
+            - Recommendations based on the research
+            - Confidence levels for major conclusions
+            - Areas requiring further research
             
-            Provide a simple assessment: TRUE, FALSE, PARTIALLY TRUE, or INSUFFICIENT INFORMATION."""
+            Keep it concise and actionable for decision-makers.""",
+    "academic": """You are a research synthesis expert. Analyze the provided research data and create a comprehensive report.
             
-        elif verification_level == "academic":
-            return f"""{base_instruction}
+            Create an academic-style research synthesis:
+            - Introduction and research methodology
+            - Literature review of sources
+            - Analysis of findings with critical evaluation
+            - Discussion of limitations and biases
+            - Conclusions and implications
+            - Recommendations for future research
             
-            Provide an academic-level fact verification:
-            - Assess the claim against established academic knowledge
-            - Identify what types of sources would be needed for verification
-            - Evaluate the specificity and verifiability of the claim
-            - Consider the methodology that would be required to prove/disprove
-            - Assess potential confounding factors or limitations
+            Use formal academic language and structure.""",
+    "brief": """You are a research synthesis expert. Analyze the provided research data and create a comprehensive report.
             
-            Provide a detailed academic assessment with confidence levels and research recommendations."""
+            Create a brief research summary:
+            - Main question and approach
+            - Top 3-5 key findings
+            - Overall conclusion
+            - Confidence level
             
-        else:  # thorough
-            return f"""{base_instruction}
+            Keep it concise and focused on the most important insights.""",
+    "comprehensive": """You are a research synthesis expert. Analyze the provided research data and create a comprehensive report.
             
-            Provide a thorough fact-checking analysis:
-            1. Break down the claim into verifiable components
-            2. Assess each component for accuracy and consistency
-            3. Identify what evidence would support or refute the claim
-            4. Consider alternative explanations or interpretations
-            5. Evaluate the credibility and reliability of any sources
-            6. Provide an overall assessment with confidence level
-            7. Suggest additional verification steps if needed
+            Create a comprehensive research report including:
+            1. Executive Summary
+            2. Research Overview and Methodology
+            3. Detailed Findings by Source/Topic
+            4. Cross-Analysis and Pattern Identification
+            5. Credibility Assessment of Sources
+            6. Conflicting Information and Limitations
+            7. Conclusions and Confidence Levels
+            8. Recommendations and Next Steps
             
-            Structure your analysis clearly and provide a final verdict: TRUE, FALSE, PARTIALLY TRUE, or NEEDS MORE RESEARCH."""
+            Structure the report clearly with headings and provide balanced analysis.""",
+}
 
 
 class ResearchSynthesisTool(Tool):
@@ -490,8 +948,9 @@ class ResearchSynthesisTool(Tool):
             # Prepare synthesis instructions
             synthesis_instructions = self._get_synthesis_instructions(report_style)
             
+            # Full page texts and repeated sources only cost tokens
             input_data = {
-                "research_data": research_data,
+                "research_data": compact_research_data(research_data),
                 "research_question": research_question,
                 "report_style": report_style
             }
@@ -532,58 +991,7 @@ class ResearchSynthesisTool(Tool):
     
     def _get_synthesis_instructions(self, report_style: str) -> str:
         """Get synthesis instructions based on the report style."""
-        base_instruction = "You are a research synthesis expert. Analyze the provided research data and create a comprehensive report."
-        
-        if report_style == "executive_summary":
-            return f"""{base_instruction}
-            
-            Create an executive summary that includes:
-            - Key findings and conclusions (bullet points)
-            - Main insights and trends identified
-            - Recommendations based on the research
-            - Confidence levels for major conclusions
-            - Areas requiring further research
-            
-            Keep it concise and actionable for decision-makers."""
-            
-        elif report_style == "academic":
-            return f"""{base_instruction}
-            
-            Create an academic-style research synthesis:
-            - Introduction and research methodology
-            - Literature review of sources
-            - Analysis of findings with critical evaluation
-            - Discussion of limitations and biases
-            - Conclusions and implications
-            - Recommendations for future research
-            
-            Use formal academic language and structure."""
-            
-        elif report_style == "brief":
-            return f"""{base_instruction}
-            
-            Create a brief research summary:
-            - Main question and approach
-            - Top 3-5 key findings
-            - Overall conclusion
-            - Confidence level
-            
-            Keep it concise and focused on the most important insights."""
-            
-        else:  # comprehensive
-            return f"""{base_instruction}
-            
-            Create a comprehensive research report including:
-            1. Executive Summary
-            2. Research Overview and Methodology
-            3. Detailed Findings by Source/Topic
-            4. Cross-Analysis and Pattern Identification
-            5. Credibility Assessment of Sources
-            6. Conflicting Information and Limitations
-            7. Conclusions and Confidence Levels
-            8. Recommendations and Next Steps
-            
-            Structure the report clearly with headings and provide balanced analysis."""
+        return _SYNTHESIS_INSTRUCTIONS.get(report_style, _SYNTHESIS_INSTRUCTIONS["comprehensive"])
 
 
 class ResearchTaskInput(BaseModel):
@@ -650,33 +1058,28 @@ def main():
 - Assessing source credibility and reliability
 - Identifying knowledge gaps and areas for further research"""
 
-        # Create Opper client for tools that need it
-        from opperai import Opper
-        opper_client = Opper(http_bearer=api_key)
-        
-        # Create research tools
-        web_search_tool = WebSearchTool()
-        content_analysis_tool = ContentAnalysisTool(opper_client)
-        fact_verification_tool = FactVerificationTool(opper_client)
-        research_synthesis_tool = ResearchSynthesisTool(opper_client)
-        
-        research_tools = [
-            web_search_tool,
-            content_analysis_tool,
-            fact_verification_tool,
-            research_synthesis_tool
-        ]
-        
         agent = BaseAgent(
             name="DeepResearchAgent",
             opper_api_key=api_key,
             callback=print_research_status,
             verbose=False,
             output_schema=ResearchResult,
-            tools=research_tools,
+            tools=[WebSearchTool()],
             description=description,
             max_iterations=15
         )
+        # Analyses and the synthesis report feed ResearchResult's detailed fields, so the
+        # final formatter sees far more of each than the default excerpt
+        agent.final_result_excerpt_chars = SYNTHESIS_FIELD_CHARS
+        
+        # The AI-backed research tools share the agent's Opper client (and its
+        # connection pool) rather than opening a second one
+        for research_tool in (
+            ContentAnalysisTool(agent.opper),
+            FactVerificationTool(agent.opper),
+            ResearchSynthesisTool(agent.opper)
+        ):
+            agent.add_tool(research_tool)
 
         research_question = "Tell me everything you can find about Opper AI"
 
@@ -3,39 +3,60 @@
 Setup script for the email agent dependencies.
 """
 
+import shutil
 import subprocess
 import sys
 import os
 
 def run_command(command):
-    """Run a shell command and return success status."""
+    """
+    Run a command (list of arguments, executed without a shell) and return success status.
+    
+    Output is read line by line as it is produced, so long installs show progress and a
+    chatty command can never block on a full pipe.
+    """
+    display = " ".join(command)
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {command}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {command}")
-        print(f"   Error: {e.stderr}")
+        # Buffered pipe (bufsize=-1): lines are still yielded as they complete, but the
+        # output is read in large chunks rather than a read() call per byte
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=-1)
+    except OSError as e:
+        print(f"❌ {display}")
+        print(f"   Error: {e}")
         return False
+    
+    with process:
+        for line in process.stdout:
+            print(f"   {line}", end="")
+    
+    if process.returncode == 0:
+        print(f"✅ {display}")
+        return True
+    print(f"❌ {display}")
+    print(f"   Error: exited with status {process.returncode}")
+    return False
 
 def main():
     """Set up the email agent environment."""
     print("🚀 Setting up Email Agent dependencies...")
     
+    # One directory listing answers every "is this file here?" check below
+    entries = {entry.name for entry in os.scandir(".")}
+    
     # Install dependencies using uv (if available) or pip
     print("\n📦 Installing Python dependencies...")
     
-    if os.path.exists("pyproject.toml"):
-        # Try uv first
-        if run_command("uv --version"):
+    if "pyproject.toml" in entries:
+        # Try uv first (looked up on PATH, no need to start it just to check)
+        if shutil.which("uv"):
             print("Using uv for dependency management...")
-            success = run_command("uv sync")
+            success = run_command(["uv", "sync"])
         else:
             print("uv not found, using pip...")
-            success = run_command("pip install -e .")
+            success = run_command([sys.executable, "-m", "pip", "install", "-e", "."])
     else:
         print("Installing dependencies directly with pip...")
-        success = run_command("pip install opperai pydantic google-api-python-client google-auth-httplib2 google-auth-oauthlib")
+        success = run_command([sys.executable, "-m", "pip", "install", "opperai", "pydantic", "google-api-python-client", "google-auth-httplib2", "google-auth-oauthlib"])
     
     if not success:
         print("❌ Failed to install Python dependencies")
@@ -46,7 +67,7 @@ def main():
     # Check for credentials
     print("\n🔐 Checking Gmail API setup...")
     
-    if os.path.exists("credentials.json"):
+    if "credentials.json" in entries:
         print("✅ Found credentials.json")
     else:
         print("❌ credentials.json not found")
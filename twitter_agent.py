@@ -4,21 +4,99 @@ Twitter Agent for interacting with Twitter/X platform using Composio tools.
 
 import os
 import json
-from typing import Any, List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple, TYPE_CHECKING
 from pydantic import BaseModel, Field
-from composio import Composio
-import time
+
+if TYPE_CHECKING:
+    from composio import Composio
 
 from base_agent import BaseAgent, Tool
 
 
+# Most Composio tool calls run at once by TwitterAgent.execute_batch
+TWITTER_BATCH_WORKERS = 8
+
+# Distinct Composio API keys whose clients are kept for reuse
+COMPOSIO_CLIENT_CACHE_SIZE = 8
+
+# Composio toolkits whose tools TwitterAgent loads
+TWITTER_TOOLKITS = ("TWITTER",)
+
+
+@lru_cache(maxsize=None)
+def _env(name: str) -> Optional[str]:
+    """Read an environment variable once; the values don't change while the process runs."""
+    return os.environ.get(name)
+
+
+@lru_cache(maxsize=256)
+def _build_tool_params(tool_name: str, properties_json: str) -> Dict[str, str]:
+    """
+    Convert a Composio parameter schema into our "type - description" parameter format.
+    
+    Args:
+        tool_name: Composio tool name (part of the cache key)
+        properties_json: JSON of the schema's properties, serialized with sorted keys
+        
+    Returns:
+        Parameter name -> description; callers copy it before handing it out
+    """
+    tool_parameters = {}
+    for param_name, param_info in json.loads(properties_json).items():
+        param_type = param_info.get("type") or "string"
+        param_description = param_info.get("description") or f"{param_name} parameter"
+        examples = param_info.get("examples")
+        
+        # Add examples to description if available
+        if examples:
+            param_description += f" Examples: {examples}"
+        
+        tool_parameters[param_name] = f"{param_type} - {param_description}"
+    return tool_parameters
+
+
+@lru_cache(maxsize=COMPOSIO_CLIENT_CACHE_SIZE)
+def _get_composio_client(api_key: Optional[str]) -> "Composio":
+    """
+    Return one Composio client per API key for the whole process.
+    
+    The client keeps its HTTP connections alive, so sharing it lets every agent and
+    tool reuse the same pool instead of paying a new TLS handshake per instance.
+    The SDK is imported here so importing this module (e.g. for create_twitter_agent
+    or TwitterResult) stays cheap.
+    """
+    from composio import Composio
+    
+    # If no API key is set at all, Composio reports the missing COMPOSIO_API_KEY itself
+    if api_key:
+        return Composio(api_key=api_key)
+    return Composio()
+
+
+@lru_cache(maxsize=512)
+def _normalize_tool_name(name: str) -> str:
+    """Agent-facing tool name: the Composio name lowercased, without its twitter_ prefix."""
+    return name.lower().removeprefix("twitter_")
+
+
 class TwitterTool(Tool):
     """Generic Twitter tool that uses Composio's direct tool execution."""
     
-    # Configure Pydantic to allow extra fields
-    model_config = {"extra": "allow"}
+    # Every attribute is a declared field, so instances carry no extras dict on top of
+    # their fields; the tools are never changed once built
+    model_config = {"extra": "forbid", "frozen": True}
     
-    def __init__(self, composio_client: Composio, user_id: str, tool_info: Dict[str, Any]):
+    # Typed as Any so pydantic keeps the client and the (large) Composio payload as-is
+    # instead of validating and copying them
+    composio_client: Any = Field(description="The Composio client used to execute the tool")
+    user_id: str = Field(description="User ID for Composio authentication")
+    composio_tool_name: str = Field(description="The tool's name in Composio")
+    tool_info: Any = Field(description="Tool information from Composio API")
+    success_message: str = Field(description="Result text reported after a successful execution")
+    
+    def __init__(self, composio_client: "Composio", user_id: str, tool_info: Dict[str, Any]):
         """
         Initialize a Twitter tool using Composio tool information.
         
@@ -28,36 +106,30 @@ class TwitterTool(Tool):
             tool_info: Tool information from Composio API
         """
         # Extract tool information from Composio response
-        function_info = tool_info.get("function", {})
-        tool_name = function_info.get("name", "unknown_tool")
-        tool_description = function_info.get("description", f"Execute {tool_name} on Twitter")
+        function_info = tool_info.get("function") or {}
+        tool_name = function_info.get("name") or "unknown_tool"
+        # The fallback description is only formatted when Composio didn't send one
+        tool_description = function_info.get("description") or f"Execute {tool_name} on Twitter"
         
         # Extract parameters from the tool schema
-        parameters_schema = function_info.get("parameters", {})
-        properties = parameters_schema.get("properties", {})
+        parameters_schema = function_info.get("parameters") or {}
+        properties = parameters_schema.get("properties") or {}
         
-        # Convert Composio parameter schema to our format
-        tool_parameters = {}
-        for param_name, param_info in properties.items():
-            param_type = param_info.get("type", "string")
-            param_description = param_info.get("description", f"{param_name} parameter")
-            examples = param_info.get("examples", [])
-            
-            # Add examples to description if available
-            if examples:
-                param_description += f" Examples: {examples}"
-            
-            tool_parameters[param_name] = f"{param_type} - {param_description}"
+        # Convert Composio parameter schema to our format; schemas are stable, so the
+        # conversion is cached on the tool name and the serialized schema
+        tool_parameters = _build_tool_params(tool_name, json.dumps(properties, sort_keys=True, default=str))
         
         super().__init__(
-            name=tool_name.lower().replace("twitter_", ""),
+            name=_normalize_tool_name(tool_name),
             description=tool_description,
-            parameters=tool_parameters
+            parameters=dict(tool_parameters),
+            composio_client=composio_client,
+            user_id=user_id,
+            composio_tool_name=tool_name,
+            tool_info=tool_info,
+            # Formatted once here rather than on every successful call
+            success_message=f"Successfully executed {tool_name}"
         )
-        self.composio_client = composio_client
-        self.user_id = user_id
-        self.composio_tool_name = tool_name
-        self.tool_info = tool_info
     
     def execute(self, _parent_span_id=None, **kwargs) -> Dict[str, Any]:
         """Execute the Twitter tool using Composio's direct execution."""
@@ -71,7 +143,7 @@ class TwitterTool(Tool):
             
             return {
                 "success": True,
-                "result": f"Successfully executed {self.composio_tool_name}",
+                "result": self.success_message,
                 "details": result,
                 "tool_name": self.name
             }
@@ -79,7 +151,7 @@ class TwitterTool(Tool):
         except Exception as e:
             return {
                 "success": False,
-                "error": f"Error executing {self.composio_tool_name}: {str(e)}",
+                "error": f"Error executing {self.composio_tool_name}: {e}",
                 "tool_name": self.name
             }
 
@@ -105,6 +177,15 @@ class TwitterAgent(BaseAgent):
     - Interact with Twitter content
     """
     
+    DESCRIPTION = """AI agent specialized in Twitter/X platform operations. I can help you:
+        - Post tweets and replies
+        - Search for tweets and trending topics
+        - Follow and unfollow users
+        - Get user profile information
+        - Analyze Twitter content and engagement
+        
+        I use Composio to securely access Twitter APIs with proper authentication."""
+    
     def __init__(
         self,
         user_id: str,
@@ -126,13 +207,14 @@ class TwitterAgent(BaseAgent):
             callback: Optional callback function for status updates
         """
         self.user_id = user_id
+        self.composio_api_key = composio_api_key or _env("COMPOSIO_API_KEY")
+        # Composio's Twitter tool listing and the tools built from it, fetched once
+        # (get_tools runs during BaseAgent.__init__, check_twitter_connection reuses it)
+        self._tool_infos_cache: Optional[list] = None
+        self._tools_cache: Optional[Tuple[Tool, ...]] = None
         
-        # Initialize Composio client
-        # If no API key provided, Composio will automatically use COMPOSIO_API_KEY env var
-        if composio_api_key:
-            self.composio = Composio(api_key=composio_api_key)
-        else:
-            self.composio = Composio()
+        # Initialize Composio client, shared with other agents using the same key
+        self.composio = _get_composio_client(self.composio_api_key)
         
         # Initialize base agent
         super().__init__(
@@ -152,20 +234,27 @@ class TwitterAgent(BaseAgent):
     
     def get_agent_description(self) -> str:
         """Return description of the Twitter agent."""
-        return """AI agent specialized in Twitter/X platform operations. I can help you:
-        - Post tweets and replies
-        - Search for tweets and trending topics
-        - Follow and unfollow users
-        - Get user profile information
-        - Analyze Twitter content and engagement
-        
-        I use Composio to securely access Twitter APIs with proper authentication."""
+        return self.DESCRIPTION
+    
+    def _get_tool_infos(self) -> list:
+        """Return Composio's Twitter tool listing, only calling the API on first use."""
+        if self._tool_infos_cache is None:
+            self._tool_infos_cache = self.composio.tools.get(user_id=self.user_id, toolkits=list(TWITTER_TOOLKITS))
+        return self._tool_infos_cache
+    
+    def invalidate_tools_cache(self):
+        """Forget the cached tool listing, so the next call fetches it from Composio again."""
+        self._tool_infos_cache = None
+        self._tools_cache = None
     
     def get_tools(self) -> List[Tool]:
         """Return the list of Twitter tools available to this agent."""
+        if self._tools_cache is not None:
+            # A fresh list over the frozen tools, since BaseAgent.add_tool appends to it
+            return list(self._tools_cache)
         try:
             # Get all available Twitter tools from Composio
-            twitter_tools = self.composio.tools.get(user_id=self.user_id, toolkits=["TWITTER"])
+            twitter_tools = self._get_tool_infos()
             
             if self.verbose:
                 print(f"📋 Found {len(twitter_tools)} Twitter tools from Composio")
@@ -178,14 +267,14 @@ class TwitterAgent(BaseAgent):
                     tools.append(twitter_tool)
                     
                     if self.verbose:
-                        tool_name = tool_info.get("function", {}).get("name", "unknown")
-                        print(f"  ✅ {tool_name}")
+                        print(f"  ✅ {twitter_tool.composio_tool_name}")
                         
                 except Exception as e:
                     if self.verbose:
                         tool_name = tool_info.get("function", {}).get("name", "unknown")
                         print(f"  ❌ Failed to create tool {tool_name}: {e}")
             
+            self._tools_cache = tuple(tools)
             return tools
             
         except Exception as e:
@@ -201,8 +290,8 @@ class TwitterAgent(BaseAgent):
             Dictionary with connection status
         """
         try:
-            # Try to get tools to verify connection
-            tools = self.composio.tools.get(user_id=self.user_id, toolkits=["TWITTER"])
+            # Try to get tools to verify connection (reusing the listing fetched for get_tools)
+            tools = self._get_tool_infos()
             
             if tools:
                 return {
@@ -252,6 +341,25 @@ class TwitterAgent(BaseAgent):
                 "success": False,
                 "error": f"Error executing {tool_name}: {str(e)}"
             }
+    
+    def execute_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute several independent Twitter tools concurrently.
+        
+        Args:
+            calls: (Composio tool name, arguments) pairs, e.g. ("TWITTER_POST_TWEET", {"text": "..."})
+            
+        Returns:
+            One execute_twitter_tool result per call, in the same order
+        """
+        if not calls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(TWITTER_BATCH_WORKERS, len(calls))) as executor:
+            return list(executor.map(
+                lambda call: self.execute_twitter_tool(call[0], **call[1]),
+                calls
+            ))
 
 
 def create_twitter_agent(user_id: str, composio_api_key: str = None, opper_api_key: str = None, verbose: bool = True) -> TwitterAgent:
@@ -280,8 +388,8 @@ if __name__ == "__main__":
     import sys
     
     # Check environment variables first
-    composio_key = os.getenv("COMPOSIO_API_KEY")
-    opper_key = os.getenv("OPPER_API_KEY")
+    composio_key = _env("COMPOSIO_API_KEY")
+    opper_key = _env("OPPER_API_KEY")
     
     if not composio_key:
         print("❌ COMPOSIO_API_KEY environment variable not set!")